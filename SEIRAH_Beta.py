@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Search for optimal beta_t in [A,B]. Step of Algorithm2, used by find_beta_t.
+f(beta) is the objective, e.g. SSE of beta_leastsquare.
+
+bisect_search:
+    Algorithm2 bisection, both ends compared every round.
+kary_search:
+    k candidate betas per round, evaluated concurrently on worker processes.
+    The interval is narrowed by a factor of k+1 per round.
+golden_search:
+    Golden-section search. The inner point kept by a round carries its SSE
+    over, so each round costs one new simulation.
+
+All return (beta_t, number of objective evaluations).
+
+Memo:
+    SSE of every beta evaluated on one day, shared by the searches. A beta
+    is simulated once, e.g. the end bisection keeps is not run again.
+
+Common_Random:
+    Objective on common random numbers. All candidates of one day run on
+    the same seeded stream, so SSE is a smooth function of beta.
+
+Note:
+    Workers are forked, so they start from the networks of the current day
+    and each candidate runs on the worker's own copy. Every candidate gets
+    a seed drawn from the main process, results do not depend on scheduling.
+"""
+
+import math
+import random
+import multiprocessing as mp
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+
+# Objective of the current search, inherited by forked workers.
+_objective = None
+
+def _evaluate(beta_seed):
+    beta, seed = beta_seed
+    SEIRAH_CSR.seed(seed)
+    return _objective(beta)
+
+def _serial_map(func, args):
+    return [func(a) for a in args]
+
+class Memo:
+    # Objective f with a table of the betas evaluated so far.
+
+    def __init__(self, f):
+        self.f = f
+        self.table = {}
+        self.evaluations = 0   # simulations, memo hits not counted
+
+    def __call__(self, beta):
+        if beta not in self.table:
+            self.table[beta] = self.f(beta)
+            self.evaluations = self.evaluations + 1
+        return self.table[beta]
+
+def _memo(f):
+    return f if isinstance(f, Memo) else Memo(f)
+
+def bisect_search(f, A, B, eps, beta_p):
+    # beta_p: beta_t the search starts from, the loop ends when the midpoint settles.
+    memo = _memo(f)
+    n_eval = memo.evaluations
+    beta_p_b = 0
+
+    while abs(beta_p - beta_p_b) >= eps:
+        beta_p = (A + B)/2
+        D_A = memo(A)
+        D_B = memo(B)
+
+        if D_A > D_B:
+            A = beta_p
+        if D_A < D_B:
+            B = beta_p
+
+        beta_p_b = (A + B)/2
+
+    return beta_p, memo.evaluations - n_eval
+
+def kary_search(f, A, B, eps, k, workers):
+    global _objective
+    memo = _memo(f)
+    n_eval = memo.evaluations
+    _objective = memo.f
+
+    # Candidate seeds come from one draw of the main stream, which is kept.
+    seeds = random.Random(random.getrandbits(32))
+    state = random.getstate(), SEIRAH_CSR.rng
+
+    # Fork is needed to hand over the networks. Otherwise run in this process.
+    if workers > 1 and 'fork' in mp.get_all_start_methods():
+        pool = mp.get_context('fork').Pool(workers)
+        evaluate = pool.map
+    else:
+        pool = None
+        evaluate = _serial_map
+
+    def evaluate_memo(betas):
+        # Betas not in the memo, on the workers. One seed per simulation.
+        todo = [b for b in dict.fromkeys(betas) if b not in memo.table]
+        D = evaluate(_evaluate, [(b, seeds.getrandbits(32)) for b in todo])
+        memo.table.update(zip(todo, D))
+        memo.evaluations = memo.evaluations + len(todo)
+        return [memo.table[b] for b in betas]
+
+    try:
+        # Grid g[0]=A ... g[k+1]=B. End points are evaluated once, at start.
+        D_A, D_B = evaluate_memo([A, B])
+
+        while (B - A) >= eps:
+            grid = [A + (B - A)*j/(k + 1) for j in range(k + 2)]
+            D = [D_A] + evaluate_memo(grid[1:-1]) + [D_B]
+
+            # Keep the segment next to the best point, on its better side.
+            j = int(np.argmin(D))
+            if j == 0 or (j < k + 1 and D[j + 1] <= D[j - 1]):
+                A, B, D_A, D_B = grid[j], grid[j + 1], D[j], D[j + 1]
+            else:
+                A, B, D_A, D_B = grid[j - 1], grid[j], D[j - 1], D[j]
+
+    finally:
+        _objective = None
+        random.setstate(state[0])
+        SEIRAH_CSR.rng = state[1]
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return (A + B)/2, memo.evaluations - n_eval
+
+class Common_Random:
+    # Seeded stream for every call. The main stream is left as it was.
+
+    def __init__(self, f, seed):
+        self.f = f
+        self.seed = seed
+
+    def __call__(self, beta):
+        state = random.getstate(), SEIRAH_CSR.rng
+        SEIRAH_CSR.seed(self.seed)
+        try:
+            return self.f(beta)
+        finally:
+            random.setstate(state[0])
+            SEIRAH_CSR.rng = state[1]
+
+def day_seed(seed, day):
+    # Seed of one calibrated day, from the run seed.
+    return int(np.random.SeedSequence([seed, day]).generate_state(1)[0])
+
+def golden_search(f, A, B, eps):
+    invphi = (math.sqrt(5) - 1)/2
+    memo = _memo(f)
+    n_eval = memo.evaluations
+
+    # A < c < d < B. One of c, d carries over to the next round.
+    c = B - invphi*(B - A)
+    d = A + invphi*(B - A)
+    D_c = memo(c)
+    D_d = memo(d)
+
+    while (B - A) >= eps:
+        if D_c < D_d:
+            B, d, D_d = d, c, D_c
+            c = B - invphi*(B - A)
+            D_c = memo(c)
+        else:
+            A, c, D_c = c, d, D_d
+            d = A + invphi*(B - A)
+            D_d = memo(d)
+
+    return (A + B)/2, memo.evaluations - n_eval
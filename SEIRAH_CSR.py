@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Array-backed network engine for SEIRAH_SW.
+Adjacency held as CSR indptr/indices, edge weight as parallel array,
+node status as int8 array. Converted from/to the networkx graphs of G_gene.
+Isolation of hospitalized and commuting nodes is a per-node mask, consulted
+by the infection step. Edge weights are not rewritten, on either backend.
+
+Note:
+    CSR_Graph also answers nwk.nodes[i]['status'], nwk[i] and
+    nwk.edges[i,nbr]['weight'], so the day loop works on either backend.
+"""
+
+import networkx as nx
+import random
+import heapq
+import pickle as pic
+import numpy as np
+
+# Status code of node. Index of STATUS is the int8 value in CSR_Graph.status.
+SUSC, EXPO, INFE, ASYM, HOSP, RECO = 0, 1, 2, 3, 4, 5
+STATUS = ['susc', 'expo', 'infe', 'asym', 'hosp', 'reco']
+STATUS_ID = {s: n for n, s in enumerate(STATUS)}
+
+# Node attributes recorded by G_gene and SEIRAH_SW, stored as int32 arrays.
+NODE_ATTR = ['S_1stday', 'E_1stday', 'I_1stday', 'A_1stday', 'H_1stday',
+             'R_1stday', 'Infe_other']
+FIRST_DAY = {EXPO: 'E_1stday', INFE: 'I_1stday', ASYM: 'A_1stday',
+             HOSP: 'H_1stday', RECO: 'R_1stday'}
+
+para_Epidemic = {'sigma':0.2,'p1':0.18,'p2':0.3,'l_AH':0.05,'l_IH':0.3,
+                 'g_AR':0.07,'g_HR':0.1}
+
+# NumPy random generator of the batched kernels. Seeded as random.seed(2020).
+rng = np.random.default_rng(2020)
+
+def seed(s):
+    global rng
+    random.seed(s)
+    rng = np.random.default_rng(s)
+
+
+class CSR_Graph:
+
+    def __init__(self, indptr, indices, weight=None, rev=None):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        N = len(self.indptr) - 1
+
+        if weight is None:
+            weight = np.ones(len(self.indices))   # all edges weight = 1
+        self.weight = np.asarray(weight, dtype=np.float64)
+
+        # rev[s] is the slot of the same undirected edge seen from the other end.
+        if rev is None:
+            rev = _twin(self.indptr, self.indices)
+        self.rev = rev
+
+        self.status = np.zeros(N, dtype=np.int8)  # all nodes as susc
+        self.node_attr = {a: np.zeros(N, dtype=np.int32) for a in NODE_ATTR}
+        self.com = np.zeros(N, dtype=bool)   # 'Com' in G.nodes[i]
+
+        # Isolation phase, set by edge_weight_0 and cleared by edge_weight_1.
+        # While set, nodes in H or commuting (status, com) infect nobody and
+        # nobody infects them. The mask follows every transition and roster change.
+        self.isolate = False
+
+        # Active set: nodes in E, I, A or H. SEIRAH_SW only visits these.
+        self.active = set()
+
+        # Number of nodes per status code, kept by every status change.
+        self.count = np.zeros(len(STATUS), dtype=np.int64)
+        self.count[SUSC] = N
+
+        # New H: nodes with H_1stday == H_day, for Rt and Tt of Count_status.
+        self.H_day = None
+        self.new_H = set()
+
+        # Open Delta of a dry run, or None.
+        self.delta = None
+
+    def reset_active(self):
+        act = (self.status >= EXPO) & (self.status <= HOSP)
+        self.active = set(np.flatnonzero(act).tolist())
+
+    def reset_count(self):
+        self.count = np.bincount(self.status, minlength=len(STATUS)).astype(np.int64)
+
+    def add_new_H(self, day, nodes):
+        # Index is of one day. A new day starts a new index.
+        if day != self.H_day:
+            self.H_day = day
+            self.new_H = set()
+        self.new_H.update(nodes)
+
+    def set_status(self, i, s):
+        _keep(self, self.status, i)
+        self.count[self.status[i]] -= 1
+        self.count[s] += 1
+        self.status[i] = s
+        if EXPO <= s <= HOSP:
+            self.active.add(i)
+        else:
+            self.active.discard(i)
+
+    def set_statuses(self, idx, s):
+        # set_status of many nodes at once. idx without repeats.
+        _keep(self, self.status, idx)
+        self.count -= np.bincount(self.status[idx], minlength=len(STATUS))
+        self.count += np.bincount(s, minlength=len(STATUS))
+        self.status[idx] = s
+        act = (s >= EXPO) & (s <= HOSP)
+        self.active.update(idx[act].tolist())
+        self.active.difference_update(idx[~act].tolist())
+
+    def is_isolated(self, i):
+        return self.isolate and (self.status[i] == HOSP or self.com[i])
+
+    def effective_weight(self):
+        # Weight of every slot in the current phase, e.g. for export.
+        if not self.isolate:
+            return self.weight.copy()
+        iso = (self.status == HOSP) | self.com
+        row = np.repeat(iso, np.diff(self.indptr))
+        return np.where(row | iso[self.indices], 0.0, self.weight)
+
+    def number_of_nodes(self):
+        return len(self.indptr) - 1
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    @property
+    def nodes(self):
+        return _NodeView(self)
+
+    @property
+    def edges(self):
+        return _EdgeView(self)
+
+    def __getitem__(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    def copy(self):
+        # Topology is shared, only node and edge state is copied.
+        C = CSR_Graph.__new__(CSR_Graph)
+        C.indptr = self.indptr
+        C.indices = self.indices
+        C.rev = self.rev
+        C.weight = self.weight.copy()
+        C.status = self.status.copy()
+        C.node_attr = {a: v.copy() for a, v in self.node_attr.items()}
+        C.com = self.com.copy()
+        C.isolate = self.isolate
+        C.active = set(self.active)
+        C.count = self.count.copy()
+        C.H_day = self.H_day
+        C.new_H = set(self.new_H)
+        C.delta = None
+        return C
+
+    def snapshot(self):
+        # Mutable simulation state only. Topology and edge weights are never
+        # copied, nothing rewrites them once the network is built.
+        return {'status': self.status.copy(),
+                'node_attr': {a: v.copy() for a, v in self.node_attr.items()},
+                'com': self.com.copy(),
+                'isolate': self.isolate,
+                'active': set(self.active),
+                'count': self.count.copy(),
+                'new_H': (self.H_day, set(self.new_H))}
+
+    def restore(self, snap):
+        # Back to snapshot, in place.
+        np.copyto(self.status, snap['status'])
+        for a, v in snap['node_attr'].items():
+            np.copyto(self.node_attr[a], v)
+        np.copyto(self.com, snap['com'])
+        self.isolate = snap['isolate']
+        self.active = set(snap['active'])
+        np.copyto(self.count, snap['count'])
+        self.H_day, self.new_H = snap['new_H'][0], set(snap['new_H'][1])
+        return self
+
+
+class _NodeView:
+    # nwk.nodes[i][key] and nwk.nodes() as in networkx.
+
+    def __init__(self, C):
+        self._C = C
+
+    def __call__(self):
+        return range(self._C.number_of_nodes())
+
+    def __iter__(self):
+        return iter(range(self._C.number_of_nodes()))
+
+    def __len__(self):
+        return self._C.number_of_nodes()
+
+    def __getitem__(self, i):
+        return _NodeAttr(self._C, i)
+
+
+class _NodeAttr:
+
+    def __init__(self, C, i):
+        self._C = C
+        self._i = i
+
+    def __getitem__(self, key):
+        if key == 'status':
+            return STATUS[self._C.status[self._i]]
+        if key == 'Com':
+            if self._C.com[self._i]:
+                return True
+            raise KeyError(key)
+        return int(self._C.node_attr[key][self._i])
+
+    def __setitem__(self, key, value):
+        if key == 'status':
+            self._C.set_status(self._i, STATUS_ID[value])
+        elif key == 'Com':
+            _keep(self._C, self._C.com, self._i)
+            self._C.com[self._i] = True
+        else:
+            _keep(self._C, self._C.node_attr[key], self._i)
+            self._C.node_attr[key][self._i] = value
+            if key == 'H_1stday':
+                self._C.add_new_H(value, (self._i,))
+
+    def __contains__(self, key):
+        if key == 'Com':
+            return bool(self._C.com[self._i])
+        return key == 'status' or key in self._C.node_attr
+
+
+class _EdgeView:
+    # nwk.edges[i,nbr]['weight'] as in networkx.
+
+    def __init__(self, C):
+        self._C = C
+
+    def __call__(self):
+        C = self._C
+        row = np.repeat(np.arange(C.number_of_nodes()), np.diff(C.indptr))
+        return [(u, v) for u, v in zip(row.tolist(), C.indices.tolist()) if u < v]
+
+    def __getitem__(self, e):
+        return _EdgeAttr(self._C, _slot(self._C, e[0], e[1]))
+
+
+class _EdgeAttr:
+
+    def __init__(self, C, s):
+        self._C = C
+        self._s = s
+
+    def __getitem__(self, key):
+        C = self._C
+        if C.is_isolated(C.indices[self._s]) or C.is_isolated(C.indices[C.rev[self._s]]):
+            return 0
+        return C.weight[self._s]
+
+    def __setitem__(self, key, value):
+        s = np.array([self._s, self._C.rev[self._s]])
+        _keep(self._C, self._C.weight, s)
+        self._C.weight[s] = value
+
+
+def _slot(C, u, v):
+    a = C.indptr[u]
+    hit = np.flatnonzero(C.indices[a:C.indptr[u + 1]] == v)
+    if len(hit) == 0:
+        raise KeyError((u, v))
+    return a + hit[0]
+
+
+def _twin(indptr, indices):
+    # Sort slots by (row, col) and by (col, row): the k-th of each is the same edge.
+    row = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    order_rc = np.lexsort((indices, row))
+    order_cr = np.lexsort((row, indices))
+    rev = np.empty(len(indices), dtype=np.int64)
+    rev[order_rc] = order_cr
+    return rev
+
+"""
+Dry run. While a Delta is open, every write to the CSR_Graph keeps the old
+value, so the network runs forward in place and is then rolled back
+(discard) or kept (commit). No copy of the network is made.
+"""
+class Delta:
+
+    def __init__(self, C):
+        if C.delta is not None:
+            raise RuntimeError('dry run already open on this network')
+        self.C = C
+        self.log = []
+        # Counters and new-H index are small, kept whole.
+        self.count = C.count.copy()
+        self.new_H = (C.H_day, set(C.new_H))
+        self.isolate = C.isolate
+        C.delta = self
+
+    def record(self, arr, idx):
+        self.log.append((arr, idx, arr[idx]))
+
+    def discard(self):
+        for arr, idx, old in reversed(self.log):
+            arr[idx] = old
+        self.log = []
+        self.C.delta = None
+        self.C.reset_active()
+        np.copyto(self.C.count, self.count)
+        self.C.H_day, self.C.new_H = self.new_H
+        self.C.isolate = self.isolate
+
+    def commit(self):
+        self.log = []
+        self.C.delta = None
+
+class _Pickle_Delta:
+    # networkx graph: whole graph pickled on open.
+
+    def __init__(self, G):
+        self.G = G
+        self.snap = pic.dumps(G)
+
+    def discard(self):
+        restore(self.G, self.snap)
+
+    def commit(self):
+        pass
+
+def dry_run(nwk):
+    if isinstance(nwk, CSR_Graph):
+        return Delta(nwk)
+    return _Pickle_Delta(nwk)
+
+def _keep(C, arr, idx):
+    if C.delta is not None:
+        C.delta.record(arr, idx)
+
+"""
+Snapshot/restore of either backend. networkx graphs fall back to pickle,
+restored in place so callers keep their references.
+"""
+def snapshot(nwk):
+    if isinstance(nwk, CSR_Graph):
+        return nwk.snapshot()
+    return pic.dumps(nwk)
+
+def restore(nwk, snap):
+    if isinstance(nwk, CSR_Graph):
+        return nwk.restore(snap)
+    nwk.__dict__.update(pic.loads(snap).__dict__)
+    return nwk
+
+"""
+City<->CBD synchronization by index arrays. com_index gives, per city, the
+commuting node ids and their CBD slot ids (cities in order, slots in a row),
+built once per roster. interconnect copies status src[src_ids] to
+dst[dst_ids] in one gather/scatter; networkx graphs are copied node by node.
+"""
+def com_index(ComLists):
+    index = []
+    count = 0  # CBD nodes index.
+    for ComList in ComLists:
+        ids = np.asarray(ComList, dtype=np.int64)
+        index.append((ids, np.arange(count, count + len(ids))))
+        count = count + len(ids)
+    return index
+
+def interconnect(src, src_ids, dst, dst_ids):
+    if isinstance(src, CSR_Graph) and isinstance(dst, CSR_Graph):
+        dst.set_statuses(dst_ids, src.status[src_ids])
+        return dst
+    for j, c in zip(src_ids.tolist(), dst_ids.tolist()):
+        dst.nodes[c]['status'] = src.nodes[j]['status']
+    return dst
+
+"""
+Conversion from/to networkx graph of G_gene or nx.newman_watts_strogatz_graph.
+Nodes must be labelled 0..N-1. Neighbour order is kept as in the adjacency
+dict, so both backends draw random numbers in the same sequence.
+"""
+def from_nx(G):
+    if isinstance(G, CSR_Graph):
+        return G
+
+    N = G.number_of_nodes()
+    deg = [len(G[i]) for i in range(N)]
+    indptr = np.zeros(N + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(deg)
+
+    indices = np.fromiter((nbr for i in range(N) for nbr in G[i]),
+                          dtype=np.int64, count=indptr[-1])
+    weight = np.fromiter((G[i][nbr].get('weight', 1) for i in range(N) for nbr in G[i]),
+                         dtype=np.float64, count=indptr[-1])
+
+    C = CSR_Graph(indptr, indices, weight)
+
+    for i in range(N):
+        attr = G.nodes[i]
+        C.status[i] = STATUS_ID[attr.get('status', 'susc')]
+        for a in NODE_ATTR:
+            C.node_attr[a][i] = attr.get(a, 0)
+        C.com[i] = 'Com' in attr
+
+    C.isolate = bool(G.graph.get('isolate', False))
+    C.reset_active()
+    C.reset_count()
+    return C
+
+def to_nx(C):
+    if not isinstance(C, CSR_Graph):
+        return C
+
+    G = nx.Graph()
+    status = C.status.tolist()
+    attr = {a: v.tolist() for a, v in C.node_attr.items()}
+
+    for i in range(C.number_of_nodes()):
+        G.add_node(i, status=STATUS[status[i]])
+        for a in NODE_ATTR:
+            G.nodes[i][a] = attr[a][i]
+        if C.com[i]:
+            G.nodes[i]['Com'] = True
+
+    row = np.repeat(np.arange(C.number_of_nodes()), np.diff(C.indptr)).tolist()
+    col = C.indices.tolist()
+    # Weights as seen in the current phase, as edge_weight_0/1 left them in nx.
+    weight = [int(w) if w.is_integer() else w for w in C.effective_weight().tolist()]
+    for s in range(len(col)):
+        if row[s] < col[s]:
+            G.add_edge(row[s], col[s], weight=weight[s])
+
+    return G
+
+"""
+Nodes mapping function of either backend. edge_weight_0 isolates hospitalized
+and commuting nodes, edge_weight_1 ends it. Only the phase changes, O(1);
+networkx graphs keep it as G.graph['isolate'], read by nx_weight.
+"""
+def edge_weight_0(C):
+    if isinstance(C, CSR_Graph):
+        C.isolate = True
+    else:
+        C.graph['isolate'] = True
+    return C
+
+def edge_weight_1(C):
+    if isinstance(C, CSR_Graph):
+        C.isolate = False
+    else:
+        C.graph['isolate'] = False
+    return C
+
+def nx_weight(G, i, nbr):
+    # Weight of edge i-nbr of a networkx graph in the current phase, as CSR_Graph.
+    if G.graph.get('isolate') and (_nx_isolated(G, i) or _nx_isolated(G, nbr)):
+        return 0
+    return G.edges[i, nbr]['weight']
+
+def _nx_isolated(G, i):
+    return G.nodes[i]['status'] == 'hosp' or 'Com' in G.nodes[i]
+
+"""
+SEIRAH_SW on CSR_Graph. Same stochastic process and random number sequence.
+record=False skips *_1stday, as SEIRAH_SW_F does. Runs in place; under an
+open Delta the changes are kept in it.
+Only the active set is visited, in node order. A node exposed ahead of the
+current one joins the queue, as it would be reached in a full sweep.
+"""
+def SEIRAH_SW_CSR(_time_stamp, C, beta_t, tau, record=True):
+
+    status = C.status
+    queue = sorted(C.active)
+
+    while queue:
+        i = heapq.heappop(queue)
+
+        # Pick node status. Infect neighbours by probability.
+        if status[i] == INFE:
+            # Precisely, infection first or change first probabilistically 0.5:0.5
+            if random.random() > 0.5:  #Infecte firstly pattern.
+                # I infect S to E probabilistically
+                _infect(_time_stamp, C, i, 1 - beta_t*tau, record, queue)
+
+                # I changes to H
+                threshold = 1 - para_Epidemic['l_IH']*tau
+                if random.random() > threshold:
+                    _change(_time_stamp, C, i, HOSP, record)
+
+            else:   #Change first pattern.
+                # I changes to H
+                threshold = 1 - para_Epidemic['l_IH']*tau
+                if random.random() > threshold:
+                    _change(_time_stamp, C, i, HOSP, record)
+
+                else:
+                    # if no change, I infect S to E probabilistically
+                    _infect(_time_stamp, C, i, 1 - beta_t*tau, record, queue)
+
+        if status[i] == ASYM:
+            # Each branch draws its own random number, as in SEIRAH_SW.
+            if 0 < random.random() <= 0.33: # Infection first pattern.
+                # A infect S to E probabilistically
+                _infect(_time_stamp, C, i, 1 - beta_t*tau, record, queue)
+
+                # A changes to R
+                threshold = 1 - (1-para_Epidemic['p2'])*para_Epidemic['g_AR']*tau
+                if random.random() > threshold:
+                    _change(_time_stamp, C, i, RECO, record)
+
+                else:
+                    # A changes to H
+                    threshold = 1 - para_Epidemic['p2']*para_Epidemic['l_AH']*tau
+                    if random.random() > threshold:
+                        _change(_time_stamp, C, i, HOSP, record)
+
+            elif 0.33 < random.random() <= 0.67: # Infection first pattern.
+                # A infect S to E probabilistically
+                _infect(_time_stamp, C, i, 1 - beta_t*tau, record, queue)
+
+                # A changes to H
+                threshold = 1 - para_Epidemic['p2']*para_Epidemic['l_AH']*tau
+                if random.random() > threshold:
+                    _change(_time_stamp, C, i, HOSP, record)
+
+                else:
+                    # A changes to R
+                    threshold = 1 - (1-para_Epidemic['p2'])*para_Epidemic['g_AR']*tau
+                    if random.random() > threshold:
+                        _change(_time_stamp, C, i, RECO, record)
+
+            elif 0.67 < random.random() <= 1.0:
+                # A changes to R
+                threshold = 1 - (1-para_Epidemic['p2'])*para_Epidemic['g_AR']*tau
+                if random.random() > threshold:
+                    _change(_time_stamp, C, i, RECO, record)
+                    continue
+
+                else:
+                    # A changes to H
+                    threshold = 1 - para_Epidemic['p2']*para_Epidemic['l_AH']*tau
+                    if random.random() > threshold:
+                        _change(_time_stamp, C, i, HOSP, record)
+
+                # A infect S to E probabilistically
+                if status[i] == ASYM:
+                    _infect(_time_stamp, C, i, 1 - beta_t*tau, record, queue)
+
+        if status[i] == EXPO:
+            # Precisely, infection first or change first probabilistically 0.5:0.5
+            if random.random() > 0.5:
+                # E infect S to E probabilistically
+                _infect(_time_stamp, C, i, 1 - beta_t*tau, record, queue)
+
+                # E changes to I
+                threshold = 1 - (1-para_Epidemic['p1'])*para_Epidemic['sigma']*tau
+                if random.random() > threshold:
+                    _change(_time_stamp, C, i, INFE, record)
+
+                else:
+                    # E changes to A
+                    threshold = 1 - para_Epidemic['p1']*para_Epidemic['sigma']*tau
+                    if random.random() > threshold:
+                        _change(_time_stamp, C, i, ASYM, record)
+            else:
+                # E changes to I
+                threshold = 1 - (1-para_Epidemic['p1'])*para_Epidemic['sigma']*tau
+                if random.random() > threshold:
+                    _change(_time_stamp, C, i, INFE, record)
+
+                else:
+                    # E changes to A
+                    threshold = 1 - para_Epidemic['p1']*para_Epidemic['sigma']*tau
+                    if random.random() > threshold:
+                        _change(_time_stamp, C, i, ASYM, record)
+
+                # E infect S to E probabilistically
+                _infect(_time_stamp, C, i, 1 - beta_t*tau, record, queue)
+
+        if status[i] == HOSP:
+            # H changes to R
+            threshold = 1 - para_Epidemic['g_HR']*tau
+            if random.random() > threshold:
+                _change(_time_stamp, C, i, RECO, record)
+
+    return C
+
+def _infect(_time_stamp, C, i, threshold, record, queue):
+    status = C.status
+    weight = C.weight
+    com = C.com
+    cut = C.isolate
+    isolate = C.is_isolated(i)
+    a = C.indptr[i]
+    for s, nbr in enumerate(C.indices[a:C.indptr[i + 1]].tolist(), a):
+        # Isolated ends: weight 0, the number is still drawn.
+        if isolate or cut and (status[nbr] == HOSP or com[nbr]):
+            probability = random.random()*0
+        else:
+            probability = random.random()*weight[s]
+        if status[nbr] == SUSC and probability > threshold:
+            if C.delta is not None:
+                C.delta.record(status, nbr)
+                C.delta.record(C.node_attr['E_1stday'], nbr)
+                C.delta.record(C.node_attr['Infe_other'], i)
+            status[nbr] = EXPO
+            C.count[SUSC] -= 1
+            C.count[EXPO] += 1
+            C.active.add(nbr)
+            if nbr > i:
+                heapq.heappush(queue, nbr)
+            if record:
+                C.node_attr['E_1stday'][nbr] = _time_stamp
+            C.node_attr['Infe_other'][i] += 1
+
+def _change(_time_stamp, C, i, new_status, record):
+    if C.delta is not None:
+        C.delta.record(C.status, i)
+        C.delta.record(C.node_attr[FIRST_DAY[new_status]], i)
+    C.count[C.status[i]] -= 1
+    C.count[new_status] += 1
+    C.status[i] = new_status
+    if new_status == RECO:
+        C.active.discard(i)
+    if record:
+        C.node_attr[FIRST_DAY[new_status]][i] = _time_stamp
+        if new_status == HOSP:
+            C.add_new_H(_time_stamp, (i,))
+
+"""
+Count_status on CSR_Graph from the counters and the new-H index.
+Costs O(new H), no scan of nodes.
+Returns counts by status code, sum of Infe_other and of H_1stday - E_1stday
+over new H, and number of new H.
+"""
+def count_status(_time_stamp, C):
+    if C.H_day == _time_stamp:
+        new_H = np.fromiter(C.new_H, dtype=np.int64, count=len(C.new_H))
+    else:
+        new_H = np.zeros(0, dtype=np.int64)
+
+    count_Infe_other = int(C.node_attr['Infe_other'][new_H].sum())
+    count_T = int((C.node_attr['H_1stday'][new_H] - C.node_attr['E_1stday'][new_H]).sum())
+
+    return C.count.tolist(), count_Infe_other, count_T, len(new_H)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+On-disk cache of generated network topologies (csr only).
+A topology is stored as .npy arrays (indptr, indices, rev of CSR_Graph)
+under a key of the generator and its parameters (gen, N, k, p, seed).
+Later runs map the arrays read only (np.load mmap_mode='r') instead of
+generating the network again. Status, node attributes and edge weights are
+not cached, set_initial of SEIRAH_Gen seeds them on every run.
+
+Usage:
+    C = SEIRAH_Cache.topology('nx', N, k, p, seed)
+    python SEIRAH_Cache.py --list
+    python SEIRAH_Cache.py --clear
+
+    nwk_cache/<key>/indptr.npy, indices.npy, rev.npy: topology arrays.
+    nwk_cache/<key>/meta.json: parameters and array sizes, written last.
+
+Note:
+    Entries of another VERSION, or whose arrays do not match meta.json, are
+    generated again. Bump VERSION when a generator changes its graphs.
+    Above max_bytes the least recently used entries are removed.
+    An entry is written to a temporary directory and renamed, so runs of
+    SEIRAH_Ensemble can share the cache.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import argparse
+import numpy as np
+import networkx as nx
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_Gen as SEIRAH_Gen
+
+VERSION = 1
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nwk_cache')
+MAX_BYTES = 2*1024**3
+ARRAYS = ['indptr', 'indices', 'rev']
+
+def key(gen, N, k, p, seed):
+    meta = params(gen, N, k, p, seed)
+    return hashlib.sha1(json.dumps(meta, sort_keys=True).encode()).hexdigest()[:16]
+
+def params(gen, N, k, p, seed):
+    return {'version': VERSION, 'gen': gen, 'N': int(N), 'k': int(k),
+            'p': float(p), 'seed': int(seed)}
+
+def generate(gen, N, k, p, seed):
+    # Topology only: all nodes susc, all edges weight 1.
+    if gen == 'numpy':
+        return SEIRAH_Gen.nws_graph(N, k, p, seed)
+    if gen == 'nx':
+        return SEIRAH_CSR.from_nx(nx.newman_watts_strogatz_graph(N, k, p, seed=seed))
+    raise ValueError('unknown generator: %s' % gen)
+
+def topology(gen, N, k, p, seed, path=CACHE_DIR, max_bytes=MAX_BYTES):
+    entry = os.path.join(path, key(gen, N, k, p, seed))
+    arrays = load(entry, params(gen, N, k, p, seed))
+    if arrays is None:
+        C = generate(gen, N, k, p, seed)
+        store(entry, params(gen, N, k, p, seed), C)
+        evict(path, max_bytes, keep=entry)
+        return C
+
+    C = SEIRAH_CSR.CSR_Graph(arrays['indptr'], arrays['indices'], rev=arrays['rev'])
+    C.reset_count()
+    return C
+
+def load(entry, meta):
+    # Arrays of a valid entry, mapped read only. None if missing or stale.
+    try:
+        with open(os.path.join(entry, 'meta.json')) as f:
+            saved = json.load(f)
+        if {a: saved.get(a) for a in meta} != meta:
+            return None
+        arrays = {a: np.load(os.path.join(entry, a + '.npy'), mmap_mode='r') for a in ARRAYS}
+    except (OSError, ValueError):
+        return None
+
+    if len(arrays['indptr']) != meta['N'] + 1 or \
+       len(arrays['indices']) != saved['edges'] or len(arrays['rev']) != saved['edges']:
+        return None
+
+    # Used now, last to be evicted.
+    os.utime(os.path.join(entry, 'meta.json'))
+    return arrays
+
+def store(entry, meta, C):
+    tmp = entry + '.tmp%d' % os.getpid()
+    os.makedirs(tmp, exist_ok=True)
+    for a in ARRAYS:
+        np.save(os.path.join(tmp, a + '.npy'), np.asarray(getattr(C, a), dtype=np.int64))
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump(dict(meta, edges=len(C.indices)), f)
+
+    # A stale entry is replaced. If another run stored it first, keep that one.
+    if os.path.exists(entry) and load(entry, meta) is None:
+        shutil.rmtree(entry, ignore_errors=True)
+    try:
+        os.rename(tmp, entry)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def entries(path=CACHE_DIR):
+    # (last use, bytes, entry) of stored topologies, oldest first.
+    found = []
+    if not os.path.isdir(path):
+        return found
+    for name in os.listdir(path):
+        entry = os.path.join(path, name)
+        meta = os.path.join(entry, 'meta.json')
+        if '.tmp' in name or not os.path.exists(meta):
+            continue
+        size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+        found.append((os.path.getmtime(meta), size, entry))
+    return sorted(found)
+
+def evict(path=CACHE_DIR, max_bytes=MAX_BYTES, keep=None):
+    found = entries(path)
+    total = sum(size for _, size, _ in found)
+    for _, size, entry in found:
+        if total <= max_bytes:
+            break
+        if entry != keep:
+            shutil.rmtree(entry, ignore_errors=True)
+            total = total - size
+    return total
+
+def invalidate(gen, N, k, p, seed, path=CACHE_DIR):
+    shutil.rmtree(os.path.join(path, key(gen, N, k, p, seed)), ignore_errors=True)
+
+def clear(path=CACHE_DIR):
+    shutil.rmtree(path, ignore_errors=True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--path', default=CACHE_DIR)
+    parser.add_argument('--list', action='store_true')
+    parser.add_argument('--clear', action='store_true')
+    parser.add_argument('--max-bytes', type=int, default=None, help='evict down to this size')
+    args = parser.parse_args()
+
+    if args.clear:
+        clear(args.path)
+    if args.max_bytes is not None:
+        evict(args.path, args.max_bytes)
+    if args.list or not (args.clear or args.max_bytes is not None):
+        for _, size, entry in entries(args.path):
+            with open(os.path.join(entry, 'meta.json')) as f:
+                print(os.path.basename(entry), size, json.load(f))
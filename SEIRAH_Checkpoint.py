@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Checkpoint and resume of the day loop of SEIRAH_main.py.
+A checkpoint is one pickle of the simulation state at the end of a day:
+city_*, CBD, roster, results so far, beta_t_S, and the random states
+(random module and SEIRAH_CSR.rng). Objects are pickled together, so the
+roster still refers to the same city networks after load.
+
+Usage:
+    python SEIRAH_main.py --checkpoint 5    # checkpoint.pkl every 5 days
+    python SEIRAH_main.py --resume          # continue from checkpoint.pkl
+
+    final_state.pkl: state after the last day of SEIRAH_main.py (HANDOFF),
+        continued by SEIRAH_PredictEnding.py. Loaded without params check.
+
+Note:
+    The file is written to checkpoint.pkl.tmp and renamed, a crash while
+    writing keeps the previous checkpoint. A checkpoint of other parameters
+    (seed, day_n, backend, ...) is refused. Resumed runs continue with the
+    same random draws, so they give the same results as uninterrupted runs.
+"""
+
+import os
+import random
+import pickle as pic
+import SEIRAH_CSR as SEIRAH_CSR
+
+VERSION = 2
+CHECKPOINT = 'checkpoint.pkl'
+HANDOFF = 'final_state.pkl'
+
+# State handed from SEIRAH_main.py to SEIRAH_PredictEnding.py.
+HANDOFF_VARS = ['city_0', 'city_1', 'city_2', 'city_3', 'CBD', 'roster', 'Com_index',
+                'beta_t_S', 'results', 'para_N_0', 'para_N_1', 'para_N_2',
+                'para_N_3', 'CBD_N', 'CBD_k', 'CBD_p']
+
+def due(day, every):
+    # Checkpoint at the end of every 'every' days. 0: never.
+    return every > 0 and (day + 1) % every == 0
+
+def save(path, day, params, state):
+    ckpt = {'version': VERSION, 'day': day, 'params': params, 'state': state,
+            'random': random.getstate(), 'rng': SEIRAH_CSR.rng}
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        pic.dump(ckpt, f, protocol=pic.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+def load(path, params=None):
+    # State of the checkpoint, random states restored. Next day is day + 1.
+    # params None: any parameters, as the handoff to SEIRAH_PredictEnding.py.
+    with open(path, 'rb') as f:
+        ckpt = pic.load(f)
+    if ckpt['version'] != VERSION:
+        raise ValueError('checkpoint version %s, expected %s' % (ckpt['version'], VERSION))
+    if params is not None and ckpt['params'] != params:
+        changed = sorted(k for k in set(params) | set(ckpt['params'])
+                         if params.get(k) != ckpt['params'].get(k))
+        raise ValueError('checkpoint of other parameters: %s' % ', '.join(changed))
+
+    random.setstate(ckpt['random'])
+    SEIRAH_CSR.rng = ckpt['rng']
+    return ckpt['day'], ckpt['state']
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Results cube of ensembles and sweeps: one memory-mapped .npy file
+(runs x days x tables x metrics) of SEIRAH_Store results, tables city_0,1,2,3
+and Shuto, metrics S, E, I, R, A, H, Rt, Tt, and a metadata sidecar per run
+(N, k, p, NCom of the cities, tau, beta_t series, seed, ...).
+
+Usage:
+    python SEIRAH_main.py --cube cube --run 3 --runs 16
+    cube = SEIRAH_Cube.Cube('cube'); cube.done(); cube['H'][:, :, 4]
+
+    cube/results.npy: runs x days x tables x metrics, float64.
+    cube/meta/run_00003.json: parameters of run 3, written after its results.
+
+Note:
+    Each run writes only its own slice and sidecar, so worker processes
+    need no locks. The file is created once (temporary name and hard link),
+    whichever run comes first. A run is done when its sidecar exists.
+    Reading maps the file read only, nothing is loaded until indexed.
+"""
+
+import os
+import json
+import numpy as np
+import SEIRAH_Store as SEIRAH_Store
+
+RESULTS = 'results.npy'
+
+def meta_path(path, run):
+    return os.path.join(path, 'meta', 'run_%05d.json' % run)
+
+def create(path, runs, days, tables=len(SEIRAH_Store.TABLES), metrics=len(SEIRAH_Store.METRICS)):
+    # Cube of zeros, or the existing one if its shape is the same.
+    shape = (runs, days, tables, metrics)
+    file = os.path.join(path, RESULTS)
+    os.makedirs(os.path.join(path, 'meta'), exist_ok=True)
+
+    if not os.path.exists(file):
+        tmp = file + '.tmp%d' % os.getpid()
+        np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float64, shape=shape).flush()
+        try:
+            os.link(tmp, file)   # fails if another run created it first
+        except FileExistsError:
+            pass
+        os.remove(tmp)
+
+    cube = np.load(file, mmap_mode='r+')
+    if cube.shape != shape:
+        raise ValueError('cube %s has shape %s, not %s' % (path, cube.shape, shape))
+    return cube
+
+def write(path, run, store, runs, meta):
+    # Results of one run (SEIRAH_Store) into its slice, then its sidecar.
+    cube = create(path, runs, len(store), len(store.tables), len(store.metrics))
+    if not 0 <= run < runs:
+        raise ValueError('run %d not in cube of %d runs' % (run, runs))
+    cube[run] = store.array
+    cube.flush()
+    del cube
+
+    file = meta_path(path, run)
+    with open(file + '.tmp', 'w') as f:
+        json.dump(dict(meta, run=run, days=len(store)), f)
+    os.replace(file + '.tmp', file)
+
+
+class Cube:
+
+    def __init__(self, path):
+        self.path = path
+        self._array = None
+
+    @property
+    def array(self):
+        # runs x days x tables x metrics, mapped at first use.
+        if self._array is None:
+            self._array = np.load(os.path.join(self.path, RESULTS), mmap_mode='r')
+        return self._array
+
+    def __len__(self):
+        return len(self.array)
+
+    def done(self):
+        return [r for r in range(len(self)) if os.path.exists(meta_path(self.path, r))]
+
+    def meta(self, run):
+        with open(meta_path(self.path, run)) as f:
+            return json.load(f)
+
+    def table(self, table):
+        # runs x days x metrics of a table, by index or name.
+        if isinstance(table, str):
+            table = SEIRAH_Store.TABLES.index(table)
+        return self.array[:, :, table]
+
+    def __getitem__(self, metric):
+        # runs x days x tables of a metric.
+        return self.array[:, :, :, SEIRAH_Store.METRICS.index(metric)]
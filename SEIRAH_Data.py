@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Dataset new_cases_cr2020.csv, parsed once into NumPy arrays indexed by day
+(row of the file, day 0 = 2020/1/16).
+
+    Date, Day: date string and weekday.
+    Tokyo, Kanagawa, Chiba, Saitama, H_Shuto: hospitalized (real H).
+    cases: Tokyo, Kanagawa, Chiba, Saitama as columns (day x 4).
+    CR_Shuto, CR_Kansai: commuting ratio.
+    Rt, Rt_Tokyo, ..., Rt_Shuto and STD_Tokyo, ..., STD_Shuto.
+    real_H: 7-day windows of H_Shuto in the (7 x 8) layout of
+        beta_leastsquare, real_H[day] = days day..day+6.
+
+Note:
+    Empty cells (days after the end of data) are NaN.
+"""
+
+import os
+import csv as cs
+import numpy as np
+
+DATA_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'new_cases_cr2020.csv')
+
+# Loaded datasets by path.
+_loaded = {}
+
+
+class Dataset:
+
+    def __init__(self, path=DATA_CSV):
+        with open(path, newline='') as f:
+            rows = list(cs.reader(f))
+        header, rows = rows[0], rows[1:]
+
+        self.Date = np.array([r[0] for r in rows])
+        self.Day = np.array([r[1] for r in rows])
+        self.index = {d: n for n, d in enumerate(self.Date.tolist())}
+
+        # STD follows its Rt_* column: STD_Tokyo, ..., STD_Shuto.
+        self.columns = []
+        for j in range(2, len(header)):
+            name = header[j]
+            if name == 'STD':
+                name = 'STD_' + header[j - 1][len('Rt_'):]
+            self.columns.append(name)
+            setattr(self, name, np.array([float(r[j]) if r[j] != '' else np.nan for r in rows]))
+
+        self.cases = np.column_stack((self.Tokyo, self.Kanagawa, self.Chiba, self.Saitama))
+
+        self.real_H = np.zeros((len(rows) - 6, 7, 8))
+        self.real_H[:, :, 5] = np.lib.stride_tricks.sliding_window_view(self.H_Shuto, 7)
+        self.real_H.flags.writeable = False
+
+    def __len__(self):
+        return len(self.Date)
+
+    def window(self, day):
+        # real_H of beta_leastsquare for the week starting at day. Read only.
+        return self.real_H[day]
+
+    def day_of(self, date):
+        return self.index[date]
+
+    def head(self, name, n):
+        # First n days of a column. Whole numbers as int, as pandas reads them.
+        x = getattr(self, name)[:n]
+        if np.all(np.isfinite(x)) and np.all(x == np.round(x)):
+            return x.astype(np.int64)
+        return x
+
+def load(path=DATA_CSV):
+    if path not in _loaded:
+        _loaded[path] = Dataset(path)
+    return _loaded[path]
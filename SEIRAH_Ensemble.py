@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Monte Carlo ensemble of SEIRAH_main.py.
+Each worker process builds one SEIRAH_main.session() of --seed, and runs its
+replicates from that initial state (snapshot/restore of SEIRAH_Session),
+each with its own seed of SEIRAH_CSR.seed and its own output directory.
+--subprocess: replicates run SEIRAH_main.py as separate processes instead
+(--seed, --out), each with networks of its own seed.
+
+Usage:
+    python SEIRAH_Ensemble.py --n 16 --workers 4 --seed 2020 --out ensemble
+
+    ensemble/run_000, run_001, ...: outputs of each replicate.
+    ensemble/ensemble_Shuto.csv, ensemble_city_*.csv: mean and quantile
+        bands of E, I, A, H, Rt, Tt per day.
+    ensemble/ensemble.npz: same bands as arrays.
+
+    Replicates draw no figures (--no-plot), see SEIRAH_Plot.py.
+    In-process replicates write output_result.npz and log.txt only, with
+    --subprocess all outputs of SEIRAH_main.py.
+    --cube: replicates also write their results into ensemble/cube
+        (SEIRAH_Cube), and bands are read from it.
+
+Note:
+    A replicate is done when its output_result.npz exists. Failed replicates
+    are reported and run again by the next call with the same --out, done
+    replicates are not rerun. Seeds depend only on --seed and the replicate
+    number, so a resumed ensemble is the same as an uninterrupted one.
+    In-process replicates share the initial networks and status of --seed,
+    they differ in the random draws of the days only. Networks are built
+    once per worker, not once per replicate.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+import contextlib
+import traceback
+import multiprocessing as mp
+import multiprocessing.pool as mpp
+import concurrent.futures as cf
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_Cube as SEIRAH_Cube
+import SEIRAH_main as SEIRAH_main
+
+# Columns of Daily_Result_ALL / cityresult_*: S, E, I, R, A, H, Rt, Tt
+BANDS = {'E':1, 'I':2, 'A':4, 'H':5, 'Rt':6, 'Tt':7}
+RESULTS = ['Daily_Result_ALL', 'cityresult_0', 'cityresult_1', 'cityresult_2', 'cityresult_3']
+TABLES = ['Shuto', 'city_0', 'city_1', 'city_2', 'city_3']   # of RESULTS in SEIRAH_Cube
+OUTPUTS = ['ensemble_Shuto.csv', 'ensemble_city_0.csv', 'ensemble_city_1.csv',
+           'ensemble_city_2.csv', 'ensemble_city_3.csv']
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'SEIRAH_main.py')
+
+def replicate_seed(seed, r):
+    # Seed of replicate r, from the ensemble seed.
+    return int(np.random.SeedSequence([seed, r]).generate_state(1)[0])
+
+def run_dir(out, r):
+    return os.path.join(out, 'run_%03d' % r)
+
+def cube_dir(out):
+    return os.path.join(out, 'cube')
+
+def is_done(out, r, cube=False):
+    done = os.path.exists(os.path.join(run_dir(out, r), 'output_result.npz'))
+    if cube:
+        done = done and os.path.exists(SEIRAH_Cube.meta_path(cube_dir(out), r))
+    return done
+
+# Session of a worker and its initial state, set by init_worker.
+sim = None
+sim_0 = None
+
+def init_worker(seed):
+    # Networks of the worker, the same in all workers of an ensemble seed.
+    global sim, sim_0
+    with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+        sim = SEIRAH_main.session(seed)
+    sim_0 = sim.snapshot()
+
+def run_session(out, r, seed, n=0, cube=False):
+    # One replicate on the session of the worker, from its initial state.
+    # Output of the run goes to log.txt.
+    path = run_dir(out, r)
+    os.makedirs(path, exist_ok=True)
+    seed_r = replicate_seed(seed, r)
+    with open(os.path.join(path, 'log.txt'), 'w') as log, contextlib.redirect_stdout(log):
+        try:
+            sim.restore(sim_0, day=0)
+            SEIRAH_CSR.seed(seed_r)
+            sim.run()
+            SEIRAH_main.save_result(sim, seed_r, os.path.join(path, 'output_result.npz'))
+            if cube:
+                SEIRAH_Cube.write(cube_dir(out), r, sim.results, n,
+                                  SEIRAH_main.cube_meta(sim, seed_r, os.path.abspath(path)))
+        except Exception:
+            traceback.print_exc(file=log)
+            return r, 1
+    return r, 0
+
+def run_replicate(out, r, seed, n=0, cube=False):
+    # One replicate in its own process. Output of the run goes to log.txt.
+    path = run_dir(out, r)
+    os.makedirs(path, exist_ok=True)
+    cmd = [sys.executable, MAIN, '--seed', str(replicate_seed(seed, r)), '--out', path, '--no-plot']
+    if cube:
+        cmd = cmd + ['--cube', cube_dir(out), '--run', str(r), '--runs', str(n)]
+    with open(os.path.join(path, 'log.txt'), 'w') as log:
+        proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+    return r, proc.returncode
+
+def completed(todo, workers, seed, out, n, cube, subproc):
+    # (replicate, return code) as the replicates end.
+    if subproc:
+        # Each replicate is a process of its own, threads only wait for them.
+        with mpp.ThreadPool(workers) as pool:
+            yield from pool.imap_unordered(lambda r: run_replicate(out, r, seed, n, cube), todo)
+        return
+
+    # Worker processes of a session each, not daemons: kary beta_search forks.
+    with cf.ProcessPoolExecutor(min(workers, len(todo)), mp_context=mp.get_context('fork'),
+                                initializer=init_worker, initargs=(seed,)) as pool:
+        futures = [pool.submit(run_session, out, r, seed, n, cube) for r in todo]
+        for future in cf.as_completed(futures):
+            yield future.result()
+
+def run(n, workers, seed, out, cube=False, subproc=False):
+    todo = [r for r in range(n) if not is_done(out, r, cube)]
+    print('replicates:', n, 'done:', n - len(todo), 'to run:', len(todo))
+    if not todo:
+        return []
+
+    failed = []
+    for r, code in completed(todo, workers, seed, out, n, cube, subproc):
+        if code == 0 and is_done(out, r, cube):
+            print('run_%03d done' % r)
+        else:
+            print('run_%03d failed, see' % r, os.path.join(run_dir(out, r), 'log.txt'))
+            failed.append(r)
+
+    return sorted(failed)
+
+def bands(out, n, q, cube=False):
+    # Stack results of done replicates: (replicates x days x 8) per result.
+    done = [r for r in range(n) if is_done(out, r, cube)]
+    stack = {k: [] for k in RESULTS}
+    if cube and done:
+        # Slices of the done runs only, read from the mapped cube.
+        c = SEIRAH_Cube.Cube(cube_dir(out))
+        for k, t in zip(RESULTS, TABLES):
+            stack[k] = c.table(t)[done]
+    for r in ([] if cube else done):
+        with np.load(os.path.join(run_dir(out, r), 'output_result.npz')) as f:
+            for k in RESULTS:
+                stack[k].append(f[k])
+
+    band = {}
+    for k in RESULTS:
+        x = np.array(stack[k])[:, :, list(BANDS.values())]
+        band[k + '_mean'] = x.mean(axis=0)
+        band[k + '_quantile'] = np.quantile(x, q, axis=0)
+    return done, band
+
+def write_bands(out, band, q):
+    header = []
+    for name in BANDS:
+        header = header + [name + '_mean'] + [name + '_q%g' % (100*p) for p in q]
+
+    for k, file in zip(RESULTS, OUTPUTS):
+        mean = band[k + '_mean']
+        quantile = band[k + '_quantile']
+        rows = np.concatenate([np.column_stack((mean[:, j], quantile[:, :, j].T))
+                               for j in range(len(BANDS))], axis=1)
+        np.savetxt(os.path.join(out, file), np.column_stack((np.arange(len(rows)), rows)),
+                   delimiter=',', header=','.join(['Day'] + header), comments='', fmt='%g')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=8, help='number of replicates')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=2020)
+    parser.add_argument('--out', default='ensemble')
+    parser.add_argument('--q', type=float, nargs='+', default=[0.05, 0.5, 0.95])
+    parser.add_argument('--cube', action='store_true', help='results cube in out/cube')
+    parser.add_argument('--subprocess', action='store_true',
+                        help='replicates as SEIRAH_main.py processes, networks of their own seeds')
+    args = parser.parse_args()
+
+    failed = run(args.n, args.workers, args.seed, args.out, args.cube, args.subprocess)
+
+    done, band = bands(args.out, args.n, args.q, args.cube)
+    if done:
+        write_bands(args.out, band, args.q)
+        np.savez(os.path.join(args.out, 'ensemble.npz'), q=args.q, runs=done, **band)
+    print('bands of', len(done), 'replicates written to', args.out)
+
+    if failed:
+        print('failed:', failed, 'run again with the same --out to resume.')
+        sys.exit(1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Final state of city_* and CBD as compact binary snapshots (.npz): status,
+*_1stday, Infe_other, Com, adjacency (CSR indptr, indices, rev) and edge
+weight with the isolation phase. Written by SEIRAH_main.py and
+SEIRAH_PredictEnding.py instead of GraphML, loaded back as CSR_Graph.
+
+Usage:
+    python SEIRAH_Export.py City_0.npz CBD.npz    # City_0.graphml, CBD.graphml
+
+Note:
+    GraphML is converted offline from the snapshot, the same file
+    nx.write_graphml(SEIRAH_CSR.to_nx(C)) gave at the end of the run.
+    Ids are stored as int32 when the network allows it.
+    compress=True: np.savez_compressed, smaller and slower.
+"""
+
+import os
+import argparse
+import numpy as np
+import networkx as nx
+import SEIRAH_CSR as SEIRAH_CSR
+
+def _ids(x):
+    x = np.asarray(x)
+    if len(x) == 0 or x.max() < 2**31:
+        return x.astype(np.int32)
+    return x
+
+def save(path, nwk, compress=False):
+    C = SEIRAH_CSR.from_nx(nwk)
+    arrays = {'indptr': _ids(C.indptr), 'indices': _ids(C.indices), 'rev': _ids(C.rev),
+              'weight': C.weight, 'status': C.status, 'com': C.com,
+              'isolate': np.array(C.isolate)}
+    for a in SEIRAH_CSR.NODE_ATTR:
+        arrays[a] = C.node_attr[a]
+    if compress:
+        np.savez_compressed(path, **arrays)
+    else:
+        np.savez(path, **arrays)
+
+def load(path):
+    with np.load(path) as f:
+        C = SEIRAH_CSR.CSR_Graph(f['indptr'], f['indices'], f['weight'],
+                                 f['rev'].astype(np.int64))
+        C.status[:] = f['status']
+        C.com[:] = f['com']
+        C.isolate = bool(f['isolate'])
+        for a in SEIRAH_CSR.NODE_ATTR:
+            C.node_attr[a][:] = f[a]
+    C.reset_active()
+    C.reset_count()
+    return C
+
+def to_graphml(path, out=None):
+    if out is None:
+        out = os.path.splitext(path)[0] + '.graphml'
+    nx.write_graphml(SEIRAH_CSR.to_nx(load(path)), out)
+    return out
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('files', nargs='+', help='snapshots (.npz) to convert to GraphML')
+    args = parser.parse_args()
+
+    for file in args.files:
+        print(file, '->', to_graphml(file))
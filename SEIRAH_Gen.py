@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Newman-Watts-Strogatz networks generated with NumPy, directly as CSR_Graph.
+Same model as nx.newman_watts_strogatz_graph: ring lattice of N nodes, each
+joined to its k/2 neighbours on both sides, and for every lattice edge u-v
+a shortcut u-w to a random node w with probability p (no self-loops, no
+repeated edges). Seeded by its own generator, so the topology depends only
+on (N, k, p, seed).
+
+nws_graph:
+    Topology, all nodes susc, all edges weight 1.
+G_gene:
+    As G_gene of SEIRAH_Session.py: nws_graph plus initial E, I, A, H, R nodes.
+set_initial:
+    Initial E, I, A, H, R nodes on a CSR_Graph of all susc nodes.
+
+Note:
+    Rejected shortcuts are drawn again in array rounds, not one by one.
+    Graphs follow the same distribution as networkx, not the same graphs.
+"""
+
+import random
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+from SEIRAH_CSR import EXPO, INFE, ASYM, HOSP, RECO
+
+def nws_graph(N, k, p, seed):
+    if k >= N:
+        raise ValueError('k >= N, choose smaller k or larger N')
+    rng = np.random.default_rng(seed)
+    half = k // 2
+
+    # Lattice edges i - (i+j)%N, j = 1..k/2.
+    u = np.repeat(np.arange(N), half)
+    v = (u + np.tile(np.arange(1, half + 1), N)) % N
+
+    # Shortcuts from u of lattice edges chosen with probability p.
+    src = u[rng.random(len(u)) < p]
+    dst = rng.integers(0, N, len(src))
+    seen = np.zeros(0, dtype=np.int64)
+
+    for r in range(100):
+        # Reject self-loops, lattice edges and repeats of shortcuts.
+        gap = np.abs(src - dst)
+        gap = np.minimum(gap, N - gap)
+        key = np.minimum(src, dst)*N + np.maximum(src, dst)
+        ok = (gap > half)
+        ok[ok] = ~np.isin(key[ok], seen)
+        _, first = np.unique(key, return_index=True)
+        once = np.zeros(len(key), dtype=bool)
+        once[first] = True
+        ok = ok & once
+
+        seen = np.concatenate((seen, key[ok]))
+        src_ok, dst_ok = src[ok], dst[ok]
+        u = np.concatenate((u, src_ok))
+        v = np.concatenate((v, dst_ok))
+
+        src = src[~ok]
+        if len(src) == 0:
+            break
+        dst = rng.integers(0, N, len(src))
+
+    # Both directions, neighbours of a node in id order.
+    row = np.concatenate((u, v))
+    col = np.concatenate((v, u))
+    order = np.lexsort((col, row))
+    indptr = np.zeros(N + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(row, minlength=N))
+
+    C = SEIRAH_CSR.CSR_Graph(indptr, col[order])
+    C.reset_count()
+    return C
+
+def G_gene(N, k, p, expo, infe, asym, hosp, reco, seed=2020):
+    return set_initial(nws_graph(N, k, p, seed), expo, infe, asym, hosp, reco)
+
+def set_initial(C, expo, infe, asym, hosp, reco, draw='numpy'):
+    # Initial SEIRAH status. Random nodes, divided by status inputed numbers.
+    # draw='random': nodes by random.sample, as G_gene of SEIRAH_Session.py.
+    # *_1stday and Infe_other stay 0.
+    N = C.number_of_nodes()
+    samp_sum = expo + infe + asym + hosp + reco
+    if draw == 'random':
+        random_n = np.array(random.sample(range(N), samp_sum), dtype=np.int64)
+    else:
+        random_n = SEIRAH_CSR.rng.choice(N, samp_sum, replace=False)
+    C.status[random_n] = np.repeat(np.array([EXPO, INFE, ASYM, HOSP, RECO], dtype=np.int8),
+                                   [expo, infe, asym, hosp, reco])
+
+    # H nodes with nbr edges of 'weight'=0, as G_gene.
+    s = np.flatnonzero(np.repeat(C.status == HOSP, np.diff(C.indptr)))
+    C.weight[s] = 0
+    C.weight[C.rev[s]] = 0
+
+    C.reset_active()
+    C.reset_count()
+    return C
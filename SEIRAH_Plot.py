@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Plotting stage of SEIRAH_main.py and SEIRAH_PredictEnding.py, separate from
+the simulation. Reads the result store (SEIRAH_Store), in the run or later
+from its saved results, and writes the figures with the non-interactive
+Agg backend. matplotlib is imported only when a figure is drawn.
+
+Usage:
+    python SEIRAH_Plot.py --out run_000    # from output_result.npz, predict_result.npz
+
+    Model.png, Beta_t.png, Hospitalized.png: SEIRAH_main.py.
+    Model_Predict.png: SEIRAH_PredictEnding.py.
+
+Note:
+    plot = False in the scripts (--no-plot of SEIRAH_main.py) skips the
+    figures of the run, SEIRAH_Ensemble replicates draw none.
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+import SEIRAH_Data as SEIRAH_Data
+import SEIRAH_Store as SEIRAH_Store
+
+def pyplot():
+    # Agg unless pyplot is already in use, e.g. in a notebook.
+    import matplotlib
+    if 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    return plt, mdates
+
+def _axis(plt, mdates):
+    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%b,%d'))
+    #plt.gca().xaxis.set_major_locator(mdates.WeekdayLocator()) #
+    plt.gca().xaxis.set_major_locator(mdates.MonthLocator()) #
+
+def model(shuto, dates, title, file):
+    # E, I, A, H of Shuto (day x S,E,I,R,A,H,Rt,Tt). S and R are much bigger, not shown.
+    plt, mdates = pyplot()
+    datem = pd.DataFrame(shuto, columns=SEIRAH_Store.METRICS, index=dates)
+    _axis(plt, mdates)
+
+    #plt.plot(datem['S'],color ='#83C69F',label = 'Susceptible')
+    plt.plot(datem['E'],color ='#F8D200',label = 'Exposed')
+    plt.plot(datem['I'],color ='#ED6E68',label = 'Infected')
+    #plt.plot(datem['R'],color ='#009DAA',label = 'Recovered')
+    plt.plot(datem['A'],color ='#6A9FD3',label = 'Asymptomatic')
+    plt.plot(datem['H'],color ='#7A1E71',label = 'Hospitalized')
+
+    plt.title(title)
+    plt.legend()
+    plt.gcf().autofmt_xdate()
+    plt.ylabel('Number')
+    plt.savefig(file)
+    plt.close()
+
+def beta_t(beta, dates, file):
+    plt, mdates = pyplot()
+    _axis(plt, mdates)
+    plt.plot(pd.Series(beta, index=dates),color ='#7A2871',label = '') #beta_t
+    plt.gcf().autofmt_xdate()
+    plt.title('') #Beta_t
+    plt.ylabel('Number')
+    plt.savefig(file)
+    plt.close()
+
+def hospitalized(shuto, real_H, dates, file):
+    plt, mdates = pyplot()
+    _axis(plt, mdates)
+    plt.plot(pd.Series(shuto[:, SEIRAH_Store.METRICS.index('H')], index=dates),
+             color ='#7A1E71',label = 'Predicted Hospitalized')
+    plt.plot(pd.Series(real_H, index=dates),color ='#6A9FD3',label = 'Real Hospitalized')
+    plt.gcf().autofmt_xdate()
+    plt.title('') #Hospitalized
+    plt.legend()
+    plt.ylabel('Number')
+    plt.savefig(file)
+    plt.close()
+
+def plot_main(shuto, beta, out='.'):
+    # Figures of SEIRAH_main.py. Day 0 is the first day of the dataset.
+    data = SEIRAH_Data.load()
+    days = len(shuto)
+    dates = pd.to_datetime(data.Date[:days])
+    model(shuto, dates, '', os.path.join(out, 'Model')) #Interconnected SEIRAH_SW Model
+    beta_t(beta, dates, os.path.join(out, 'Beta_t'))
+    hospitalized(shuto, data.H_Shuto[:days], dates, os.path.join(out, 'Hospitalized'))
+
+def plot_predict(shuto, dates, out='.'):
+    model(shuto, pd.to_datetime(dates), 'Interconnected SEIRAH_SW Model_Predict',
+          os.path.join(out, 'Model_Predict'))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--out', default='.', help='directory of the run')
+    args = parser.parse_args()
+
+    file = os.path.join(args.out, 'output_result.npz')
+    if os.path.exists(file):
+        with np.load(file) as f:
+            plot_main(f['Daily_Result_ALL'], f['beta_t_S'], args.out)
+        print('Model, Beta_t, Hospitalized written to', args.out)
+
+    file = os.path.join(args.out, 'predict_result.npz')
+    if os.path.exists(file):
+        with np.load(file) as f:
+            plot_predict(f['Daily_Result_ALL'], f['dates'], args.out)
+        print('Model_Predict written to', args.out)
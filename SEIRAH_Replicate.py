@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Replicate-batched SEIRAH engine. R stochastic runs of one network advance
+together. Topology (CSR indptr/indices) is shared, node state is held as
+2-D (replicates x nodes) arrays, and one array pass applies a tau phase
+to every replicate.
+
+Replicate_Graph:
+    Node state of R replicates on the topology of a CSR_Graph.
+SEIRAH_SW_R:
+    SEIRAH_SW_B on all replicates at once. Same ordering semantics.
+Count_status_R:
+    Count_status of every replicate, (R x 8): S, E, I, R, A, H, Rt, Tt.
+run:
+    Day loop of SEIRAH_main.py (cities + CBD) for a given beta_t series,
+    e.g. beta_t_S calibrated by a main run.
+
+Note:
+    A node of replicate r is addressed by its flat id r*N + i.
+"""
+
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_SW_B as SEIRAH_SW_B
+from SEIRAH_CSR import SUSC, EXPO, INFE, ASYM, HOSP, RECO, FIRST_DAY
+
+
+class Replicate_Graph:
+
+    def __init__(self, C, R):
+        # Topology and weights of C are shared. Every replicate starts from the state of C.
+        self.indptr = C.indptr
+        self.indices = C.indices
+        self.weight = C.weight
+        self.R = R
+
+        # Isolation phase of all replicates, as CSR_Graph.isolate.
+        self.isolate = C.isolate
+        self.status = np.repeat(C.status[None, :], R, axis=0)
+        self.node_attr = {a: np.repeat(v[None, :], R, axis=0) for a, v in C.node_attr.items()}
+        self.com = np.repeat(C.com[None, :], R, axis=0)
+
+        # New H of every replicate, nodes hospitalized on day H_day, as CSR_Graph.new_H.
+        self.H_day = C.H_day
+        self.new_H = np.zeros((R, len(C.status)), dtype=bool)
+        self.new_H[:, sorted(C.new_H)] = True
+
+    def number_of_nodes(self):
+        return len(self.indptr) - 1
+
+"""
+One tau phase on all replicates.
+"""
+def SEIRAH_SW_R(_time_stamp, RG, beta_t, tau, record=True):
+
+    rng = SEIRAH_CSR.rng
+    status = RG.status.reshape(-1)
+
+    active = np.flatnonzero((status >= EXPO) & (status <= HOSP))
+    s = status[active]
+    node_I = active[s == INFE]
+    node_A = active[s == ASYM]
+    node_E = active[s == EXPO]
+    node_H = active[s == HOSP]
+
+    # Transitions as SEIRAH_SW_B, flat ids of all replicates.
+    infector, new_H, to_R, E2I, E2A = SEIRAH_SW_B.transitions(rng, node_I, node_A, node_E, tau)
+
+    _infect(_time_stamp, RG, infector, 1 - beta_t*tau, record)
+
+    _change(_time_stamp, RG, new_H, HOSP, record)
+    _change(_time_stamp, RG, to_R, RECO, record)
+    _change(_time_stamp, RG, E2I, INFE, record)
+    _change(_time_stamp, RG, E2A, ASYM, record)
+
+    # H changes to R, including H of this phase.
+    _change(_time_stamp, RG, SEIRAH_SW_B.recovery(rng, np.concatenate((node_H, new_H)), tau), RECO, record)
+
+    return RG
+
+def _infect(_time_stamp, RG, infector, threshold, record):
+    N = RG.number_of_nodes()
+    infector = np.sort(infector)
+    r, i = np.divmod(infector, N)
+    start = RG.indptr[i]
+    deg = RG.indptr[i + 1] - start
+
+    # Slots of all edges of infectors, replicate by replicate in node order.
+    offset = np.cumsum(deg) - deg
+    slot = np.repeat(start - offset, deg) + np.arange(deg.sum())
+    r_slot = np.repeat(r, deg)
+    nbr = r_slot*N + RG.indices[slot]
+
+    weight = RG.weight[slot]
+    if RG.isolate:
+        # Isolated ends (H or commuting) in this phase: weight 0.
+        status, com = RG.status.reshape(-1), RG.com.reshape(-1)
+        iso = (status[infector] == HOSP) | com[infector]
+        cut = np.repeat(iso, deg) | (status[nbr] == HOSP) | com[nbr]
+        weight = np.where(cut, 0.0, weight)
+
+    probability = SEIRAH_CSR.rng.random(len(slot))*weight
+    hit = (RG.status.reshape(-1)[nbr] == SUSC) & (probability > threshold)
+
+    # A susceptible node is exposed once, by the first infector reaching it.
+    nbr_E, first = np.unique(nbr[hit], return_index=True)
+    owner = np.repeat(infector, deg)[hit][first]
+
+    RG.status.reshape(-1)[nbr_E] = EXPO
+    if record:
+        RG.node_attr['E_1stday'].reshape(-1)[nbr_E] = _time_stamp
+    np.add.at(RG.node_attr['Infe_other'].reshape(-1), owner, 1)
+
+def _change(_time_stamp, RG, node, new_status, record):
+    RG.status.reshape(-1)[node] = new_status
+    if record:
+        RG.node_attr[FIRST_DAY[new_status]].reshape(-1)[node] = _time_stamp
+        if new_status == HOSP:
+            # Index is of one day. A new day starts a new index.
+            if _time_stamp != RG.H_day:
+                RG.H_day = _time_stamp
+                RG.new_H[:] = False
+            RG.new_H.reshape(-1)[node] = True
+
+"""
+Nodes mapping function of all replicates. Same rule as SEIRAH_CSR.edge_weight_0/1.
+"""
+def edge_weight_0(RG):
+    RG.isolate = True
+    return RG
+
+def edge_weight_1(RG):
+    RG.isolate = False
+    return RG
+
+"""
+Count statuses of every replicate, as Count_status of SEIRAH_Session.py on a
+CSR_Graph: new H are the nodes of the new-H index of the day
+(SEIRAH_CSR.count_status), not every node with H_1stday of the day.
+"""
+def Count_status_R(__time_stamp, RG):
+
+    R = RG.R
+    code = np.arange(R)[:, None]*6 + RG.status
+    num = np.bincount(code.reshape(-1), minlength=R*6).reshape(R, 6)
+
+    #Filter out new H, to count Rt, Tt
+    new_H = RG.new_H if RG.H_day == __time_stamp else np.zeros_like(RG.new_H)
+    count_Infe_other = (RG.node_attr['Infe_other']*new_H).sum(axis=1)
+    count_T = ((RG.node_attr['H_1stday'] - RG.node_attr['E_1stday'])*new_H).sum(axis=1)
+
+    num_H = num[:, HOSP]
+    Rt = np.divide(count_Infe_other, num_H, out=np.zeros(R), where=num_H > 0)
+    Tt = np.divide(count_T, num_H, out=np.zeros(R), where=num_H > 0)
+
+    return np.column_stack((num[:, SUSC], num[:, EXPO], num[:, INFE], num[:, RECO],
+                            num[:, ASYM], num_H, Rt, Tt))
+
+"""
+Commuters. ids[r] are the commuting nodes of replicate r, sampled per replicate.
+Commuters of the previous day are cleared, as SEIRAH_Roster.
+"""
+def sample_commuters(RG, n):
+    rng = SEIRAH_CSR.rng
+    N = RG.number_of_nodes()
+    ids = np.stack([rng.choice(N, n, replace=False) for r in range(RG.R)]) if n > 0 \
+          else np.zeros((RG.R, 0), dtype=np.int64)
+    RG.com[:] = False
+    RG.com[np.arange(RG.R)[:, None], ids] = True
+    return ids
+
+def sync(src, src_ids, dst, dst_ids):
+    # Copy status src[r, src_ids[r]] -> dst[r, dst_ids[r]] for every replicate.
+    r = np.arange(src.R)[:, None]
+    dst.status[r, dst_ids] = src.status[r, src_ids]
+
+"""
+Day loop of SEIRAH_main.py on replicates, for a given beta_t series.
+city_R: list of Replicate_Graph, CBD_R: Replicate_Graph, NCom: base commuters
+per city, CR: commuting ratio per day, beta_t: per day.
+Returns results (days x R x cities x 8).
+"""
+def run(city_R, CBD_R, NCom, CR, beta_t, tau, days):
+
+    R = CBD_R.R
+    result = np.zeros((days, R, len(city_R), 8))
+
+    for day in range(days):
+
+        # Commuters of the day, to CBD slots in city order.
+        com_ids = []
+        slots = []
+        count = 0
+        for cr, RG in enumerate(city_R):
+            n = int(NCom[cr]*CR[day])
+            com_ids.append(sample_commuters(RG, n))
+            slots.append(np.broadcast_to(np.arange(count, count + n), (R, n)))
+            count = count + n
+
+        for cr, RG in enumerate(city_R):
+            sync(RG, com_ids[cr], CBD_R, slots[cr])
+        edge_weight_0(CBD_R)
+
+        for RG in city_R:  # all cities in tau[0] TimeZone
+            SEIRAH_SW_R(day, RG, beta_t[day], tau[0])
+            edge_weight_0(RG)
+
+        for cr, RG in enumerate(city_R):  # Interconnect_City2CBD
+            sync(RG, com_ids[cr], CBD_R, slots[cr])
+
+        SEIRAH_SW_R(day, CBD_R, beta_t[day], tau[1])
+
+        for RG in city_R:  # all cities in TimeZone tau[1]
+            SEIRAH_SW_R(day, RG, beta_t[day], tau[1])
+            edge_weight_1(RG)
+
+        for cr, RG in enumerate(city_R):  # Interconnect_CBD2City
+            sync(CBD_R, slots[cr], RG, com_ids[cr])
+
+        for cr, RG in enumerate(city_R):
+            result[day, :, cr] = Count_status_R(day, RG)
+
+    return result
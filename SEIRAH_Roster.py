@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Daily commuter roster of city_0,1,2,3.
+Each city has a fixed buffer of NCom node ids (CR = 1). Every day the
+roster is resampled: int(NCom*CR) distinct nodes are drawn with NumPy,
+the 'Com' flags of the previous day are cleared and the new ones set.
+resample returns the City<->CBD index of the day (SEIRAH_CSR.com_index),
+views into the buffers, so memory stays flat however long the run.
+
+Note:
+    CR > 1 would need more CBD nodes than the network has, refused.
+"""
+
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+
+
+class Roster:
+
+    def __init__(self, cities, NCom):
+        self.cities = cities
+        self.buffer = [np.zeros(n, dtype=np.int64) for n in NCom]
+        self.n = [0 for n in NCom]
+
+        # CBD slot ids, cities in order. Slots of a day are its first nodes.
+        self.slots = np.arange(sum(NCom))
+
+    def resample(self, CR):
+        rng = SEIRAH_CSR.rng
+        index = []
+        count = 0  # CBD nodes index.
+
+        for c, city in enumerate(self.cities):
+            n = int(len(self.buffer[c])*CR)
+            if n > len(self.buffer[c]):
+                raise ValueError('CR > 1: commuters exceed the roster of city_%d' % c)
+
+            # Previous commuters are back home.
+            set_com(city, self.buffer[c][:self.n[c]], False)
+
+            self.buffer[c][:n] = rng.choice(city.number_of_nodes(), n, replace=False)
+            self.n[c] = n
+            set_com(city, self.buffer[c][:n], True)
+
+            index.append((self.buffer[c][:n], self.slots[count:count + n]))
+            count = count + n
+
+        return index
+
+    def snapshot(self):
+        # Commuters of the day. Their 'Com' flags are node state of the cities.
+        return {'buffer': [b.copy() for b in self.buffer], 'n': list(self.n)}
+
+    def restore(self, snap):
+        for b, v in zip(self.buffer, snap['buffer']):
+            np.copyto(b, v)
+        self.n = list(snap['n'])
+        return self
+
+def set_com(city, ids, flag):
+    # 'Com' of nodes ids. networkx graphs keep it as node attribute.
+    if isinstance(city, SEIRAH_CSR.CSR_Graph):
+        city.com[ids] = flag
+    elif flag:
+        for j in ids.tolist():
+            city.nodes[j]['Com'] = True
+    else:
+        for j in ids.tolist():
+            city.nodes[j].pop('Com', None)
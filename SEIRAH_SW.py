@@ -11,18 +11,22 @@ Record status transition in node as {'key':value}.
 import networkx as nx
 import random
 from random import sample
-import matplotlib.pyplot as plt1
-import matplotlib.pyplot as plt2
-import matplotlib.pyplot as plt3
-import matplotlib.dates as mdates
 import numpy as np
 import pandas as pd
 import copy as co
 import csv as cs
 import pickle as pic
 import datetime
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_SW_B as SEIRAH_SW_B
 
-def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau):
+def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau,batch=False):
+    
+    # Array-backed network. Same process on CSR arrays, node by node or batched.
+    if isinstance(_nwks, SEIRAH_CSR.CSR_Graph):
+        if batch:
+            return SEIRAH_SW_B.SEIRAH_SW_B(_time_stamp,_nwks,beta_t,tau)
+        return SEIRAH_CSR.SEIRAH_SW_CSR(_time_stamp,_nwks,beta_t,tau)
     
     para_Epidemic = {'sigma':0.2,'p1':0.18,'p2':0.3,'l_AH':0.05,'l_IH':0.3,
                  'g_AR':0.07,'g_HR':0.1}
@@ -36,7 +40,7 @@ def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau):
                 # I infect S to E probabilistically
                 threshold = 1 - beta_t*tau
                 for nbr in _nwks[i]:
-                    probability = random.random()*_nwks.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks,i,nbr)
                     if _nwks.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks.nodes[nbr]['status'] = 'expo'
                         _nwks.nodes[nbr]['E_1stday'] = _time_stamp
@@ -60,7 +64,7 @@ def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau):
                     # if no change, I infect S to E probabilistically
                     threshold = 1 - beta_t*tau
                     for nbr in _nwks[i]:
-                        probability = random.random()*_nwks.edges[i,nbr]['weight']
+                        probability = random.random()*SEIRAH_CSR.nx_weight(_nwks,i,nbr)
                         if _nwks.nodes[nbr]['status'] == 'susc' and probability > threshold:
                             _nwks.nodes[nbr]['status'] = 'expo'
                             _nwks.nodes[nbr]['E_1stday'] = _time_stamp
@@ -73,7 +77,7 @@ def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau):
                 # A infect S to E probabilistically
                 threshold = 1- beta_t*tau
                 for nbr in _nwks[i]:
-                    probability = random.random()*_nwks.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks,i,nbr)
                     if _nwks.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks.nodes[nbr]['status'] = 'expo'
                         _nwks.nodes[nbr]['E_1stday'] = _time_stamp
@@ -96,7 +100,7 @@ def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau):
                 # A infect S to E probabilistically
                 threshold = 1- beta_t*tau
                 for nbr in _nwks[i]:
-                    probability = random.random()*_nwks.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks,i,nbr)
                     if _nwks.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks.nodes[nbr]['status'] = 'expo'
                         _nwks.nodes[nbr]['E_1stday'] = _time_stamp
@@ -134,7 +138,7 @@ def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau):
                 if _nwks.nodes[i]['status'] == 'asym':
                     threshold = 1- beta_t*tau
                     for nbr in _nwks[i]:
-                        probability = random.random()*_nwks.edges[i,nbr]['weight']
+                        probability = random.random()*SEIRAH_CSR.nx_weight(_nwks,i,nbr)
                         if _nwks.nodes[nbr]['status'] == 'susc' and probability > threshold:
                             _nwks.nodes[nbr]['status'] = 'expo'
                             _nwks.nodes[nbr]['E_1stday'] = _time_stamp
@@ -149,7 +153,7 @@ def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau):
                 # E infect S to E probabilistically
                 threshold = 1 - beta_t*tau
                 for nbr in _nwks[i]:
-                    probability = random.random()*_nwks.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks,i,nbr)
                     if _nwks.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks.nodes[nbr]['status'] = 'expo'
                         _nwks.nodes[nbr]['E_1stday'] = _time_stamp
@@ -184,7 +188,7 @@ def SEIRAH_SW(_time_stamp,_nwks,beta_t,tau):
                 # E infect S to E probabilistically
                 threshold = 1 - beta_t*tau
                 for nbr in _nwks[i]:
-                    probability = random.random()*_nwks.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks,i,nbr)
                     if _nwks.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks.nodes[nbr]['status'] = 'expo'
                         _nwks.nodes[nbr]['E_1stday'] = _time_stamp
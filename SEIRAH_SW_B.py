@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batched SEIRAH_SW on CSR_Graph. One tau phase in NumPy array passes.
+Uniforms are drawn for every node of a compartment at once, and status
+is updated by masks, with the ordering of SEIRAH_SW:
+    I: infection first or change first 0.5:0.5.
+    A: three patterns, each drawing its own uniform (0.33/0.33/0.34 order).
+    E: infection first or change first 0.5:0.5 (E infects in both).
+    H: nodes entering H in this phase may also change to R, as in SEIRAH_SW.
+
+Note:
+    Compartments are taken at the start of the phase. Nodes exposed in
+    this phase start their own transitions in the next phase.
+"""
+
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+from SEIRAH_CSR import SUSC, EXPO, INFE, ASYM, HOSP, RECO, FIRST_DAY, para_Epidemic
+
+def SEIRAH_SW_B(_time_stamp, C, beta_t, tau, record=True):
+
+    rng = SEIRAH_CSR.rng
+
+    # Compartments from the active set, not the whole population.
+    active = np.sort(np.fromiter(C.active, dtype=np.int64, count=len(C.active)))
+    status = C.status[active]
+
+    node_I = active[status == INFE]
+    node_A = active[status == ASYM]
+    node_E = active[status == EXPO]
+    node_H = active[status == HOSP]
+
+    infector, new_H, to_R, E2I, E2A = transitions(rng, node_I, node_A, node_E, tau)
+
+    # S to E by all infectious nodes of this phase.
+    _infect(_time_stamp, C, infector, 1 - beta_t*tau, record)
+
+    _change(_time_stamp, C, new_H, HOSP, record)
+    _change(_time_stamp, C, to_R, RECO, record)
+    _change(_time_stamp, C, E2I, INFE, record)
+    _change(_time_stamp, C, E2A, ASYM, record)
+
+    # H changes to R, including H of this phase.
+    _change(_time_stamp, C, recovery(rng, np.concatenate((node_H, new_H)), tau), RECO, record)
+
+    return C
+
+"""
+Transitions of one tau phase, shared with SEIRAH_Replicate. Node arrays of
+I, A, E at the start of the phase. Returns infectors of the phase and the
+nodes to H, A to R, E to I, E to A. Uniforms are drawn in this order.
+"""
+def transitions(rng, node_I, node_A, node_E, tau, para_Epidemic=para_Epidemic):
+
+    # I: infection first (>0.5) or change first. I changes to H.
+    first = rng.random(len(node_I)) > 0.5
+    I2H = rng.random(len(node_I)) > 1 - para_Epidemic['l_IH']*tau
+    infe_I = node_I[first | ~I2H]
+
+    # A: pattern 1 R->H, pattern 2 H->R, pattern 3 R->H then infect if still A.
+    # Each elif of SEIRAH_SW draws a new number, so some A do nothing.
+    u = rng.random((3, len(node_A)))
+    pat_1 = (0 < u[0]) & (u[0] <= 0.33)
+    pat_2 = ~pat_1 & (0.33 < u[1]) & (u[1] <= 0.67)
+    pat_3 = ~pat_1 & ~pat_2 & (0.67 < u[2]) & (u[2] <= 1.0)
+    A2R = rng.random(len(node_A)) > 1 - (1-para_Epidemic['p2'])*para_Epidemic['g_AR']*tau
+    A2H = rng.random(len(node_A)) > 1 - para_Epidemic['p2']*para_Epidemic['l_AH']*tau
+    to_R = (pat_1 | pat_3) & A2R | pat_2 & A2R & ~A2H
+    to_H = (pat_1 | pat_3) & ~A2R & A2H | pat_2 & A2H
+    infe_A = node_A[pat_1 | pat_2 | pat_3 & ~to_R & ~to_H]
+
+    # E: infects in both patterns. E changes to I, else to A.
+    E2I = rng.random(len(node_E)) > 1 - (1-para_Epidemic['p1'])*para_Epidemic['sigma']*tau
+    E2A = ~E2I & (rng.random(len(node_E)) > 1 - para_Epidemic['p1']*para_Epidemic['sigma']*tau)
+
+    return (np.concatenate((infe_I, infe_A, node_E)), np.concatenate((node_I[I2H], node_A[to_H])),
+            node_A[to_R], node_E[E2I], node_E[E2A])
+
+def recovery(rng, node_H, tau, para_Epidemic=para_Epidemic):
+    # H to R, drawn after the infection pass. node_H includes H of this phase.
+    return node_H[rng.random(len(node_H)) > 1 - para_Epidemic['g_HR']*tau]
+
+def _infect(_time_stamp, C, infector, threshold, record):
+    infector = np.sort(infector)
+    start = C.indptr[infector]
+    deg = C.indptr[infector + 1] - start
+
+    # Slots of all edges of infectors, in node order.
+    offset = np.cumsum(deg) - deg
+    slot = np.repeat(start - offset, deg) + np.arange(deg.sum())
+    nbr = C.indices[slot]
+
+    weight = C.weight[slot]
+    if C.isolate:
+        # Isolated ends (H or commuting) in this phase: weight 0.
+        iso = (C.status[infector] == HOSP) | C.com[infector]
+        cut = np.repeat(iso, deg) | (C.status[nbr] == HOSP) | C.com[nbr]
+        weight = np.where(cut, 0.0, weight)
+
+    probability = SEIRAH_CSR.rng.random(len(slot))*weight
+    hit = (C.status[nbr] == SUSC) & (probability > threshold)
+
+    # A susceptible node is exposed once, by the first infector reaching it.
+    nbr_E, first = np.unique(nbr[hit], return_index=True)
+    owner = np.repeat(infector, deg)[hit][first]
+
+    if C.delta is not None:
+        C.delta.record(C.status, nbr_E)
+        C.delta.record(C.node_attr['E_1stday'], nbr_E)
+        C.delta.record(C.node_attr['Infe_other'], owner)
+    C.status[nbr_E] = EXPO
+    C.count[SUSC] -= len(nbr_E)
+    C.count[EXPO] += len(nbr_E)
+    C.active.update(nbr_E.tolist())
+    if record:
+        C.node_attr['E_1stday'][nbr_E] = _time_stamp
+    np.add.at(C.node_attr['Infe_other'], owner, 1)
+
+def _change(_time_stamp, C, node, new_status, record):
+    if C.delta is not None:
+        C.delta.record(C.status, node)
+        C.delta.record(C.node_attr[FIRST_DAY[new_status]], node)
+    C.count -= np.bincount(C.status[node], minlength=len(C.count))
+    C.count[new_status] += len(node)
+    C.status[node] = new_status
+    if new_status == RECO:
+        C.active.difference_update(node.tolist())
+    if record:
+        C.node_attr[FIRST_DAY[new_status]][node] = _time_stamp
+        if new_status == HOSP:
+            C.add_new_H(_time_stamp, node.tolist())
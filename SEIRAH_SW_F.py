@@ -13,18 +13,26 @@ Note:
 import networkx as nx
 import random
 from random import sample
-import matplotlib.pyplot as plt1
-import matplotlib.pyplot as plt2
-import matplotlib.pyplot as plt3
-import matplotlib.dates as mdates
 import numpy as np
 import pandas as pd
 import copy as co
 import csv as cs
 import pickle as pic
 import datetime
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_SW_B as SEIRAH_SW_B
 
-def SEIRAH_SW_F(_nwks,beta_t,tau):
+def SEIRAH_SW_F(_nwks,beta_t,tau,batch=False):
+    
+    # Array-backed network. Under an open dry run (SEIRAH_CSR.dry_run) the
+    # network runs in place and changes go to its Delta, otherwise a copy of
+    # node state is made. Topology is shared.
+    if isinstance(_nwks, SEIRAH_CSR.CSR_Graph):
+        if _nwks.delta is None:
+            _nwks = _nwks.copy()
+        if batch:
+            return SEIRAH_SW_B.SEIRAH_SW_B(0,_nwks,beta_t,tau,record=False)
+        return SEIRAH_CSR.SEIRAH_SW_CSR(0,_nwks,beta_t,tau,record=False)
     
     para_Epidemic = {'sigma':0.2,'p1':0.18,'p2':0.3,'l_AH':0.05,'l_IH':0.3,
                  'g_AR':0.07,'g_HR':0.1}
@@ -40,7 +48,7 @@ def SEIRAH_SW_F(_nwks,beta_t,tau):
                 # I infect S to E probabilistically
                 threshold = 1 - beta_t*tau
                 for nbr in _nwks_F[i]:
-                    probability = random.random()*_nwks_F.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks_F,i,nbr)
                     if _nwks_F.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks_F.nodes[nbr]['status'] = 'expo'
                         #_nwks.nodes[nbr]['E_1stday'] = time_stamp
@@ -64,7 +72,7 @@ def SEIRAH_SW_F(_nwks,beta_t,tau):
                     # if no change, I infect S to E probabilistically
                     threshold = 1 - beta_t*tau
                     for nbr in _nwks_F[i]:
-                        probability = random.random()*_nwks_F.edges[i,nbr]['weight']
+                        probability = random.random()*SEIRAH_CSR.nx_weight(_nwks_F,i,nbr)
                         if _nwks_F.nodes[nbr]['status'] == 'susc' and probability > threshold:
                             _nwks_F.nodes[nbr]['status'] = 'expo'
                             #_nwks.nodes[nbr]['E_1stday'] = time_stamp
@@ -77,7 +85,7 @@ def SEIRAH_SW_F(_nwks,beta_t,tau):
                 # A infect S to E probabilistically
                 threshold = 1- beta_t*tau
                 for nbr in _nwks_F[i]:
-                    probability = random.random()*_nwks_F.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks_F,i,nbr)
                     if _nwks_F.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks_F.nodes[nbr]['status'] = 'expo'
                         #_nwks.nodes[nbr]['E_1stday'] = time_stamp
@@ -100,7 +108,7 @@ def SEIRAH_SW_F(_nwks,beta_t,tau):
                 # A infect S to E probabilistically
                 threshold = 1- beta_t*tau
                 for nbr in _nwks_F[i]:
-                    probability = random.random()*_nwks_F.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks_F,i,nbr)
                     if _nwks_F.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks_F.nodes[nbr]['status'] = 'expo'
                         #_nwks.nodes[nbr]['E_1stday'] = time_stamp
@@ -138,7 +146,7 @@ def SEIRAH_SW_F(_nwks,beta_t,tau):
                 if _nwks_F.nodes[i]['status'] == 'asym':
                     threshold = 1- beta_t*tau
                     for nbr in _nwks_F[i]:
-                        probability = random.random()*_nwks_F.edges[i,nbr]['weight']
+                        probability = random.random()*SEIRAH_CSR.nx_weight(_nwks_F,i,nbr)
                         if _nwks_F.nodes[nbr]['status'] == 'susc' and probability > threshold:
                             _nwks_F.nodes[nbr]['status'] = 'expo'
                            # _nwks.nodes[nbr]['E_1stday'] = time_stamp
@@ -153,7 +161,7 @@ def SEIRAH_SW_F(_nwks,beta_t,tau):
                 # E infect S to E probabilistically
                 threshold = 1 - beta_t*tau
                 for nbr in _nwks_F[i]:
-                    probability = random.random()*_nwks_F.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks_F,i,nbr)
                     if _nwks_F.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks_F.nodes[nbr]['status'] = 'expo'
                         #_nwks.nodes[nbr]['E_1stday'] = time_stamp
@@ -188,7 +196,7 @@ def SEIRAH_SW_F(_nwks,beta_t,tau):
                 # E infect S to E probabilistically
                 threshold = 1 - beta_t*tau
                 for nbr in _nwks_F[i]:
-                    probability = random.random()*_nwks_F.edges[i,nbr]['weight']
+                    probability = random.random()*SEIRAH_CSR.nx_weight(_nwks_F,i,nbr)
                     if _nwks_F.nodes[nbr]['status'] == 'susc' and probability > threshold:
                         _nwks_F.nodes[nbr]['status'] = 'expo'
                         #_nwks.nodes[nbr]['E_1stday'] = time_stamp
@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Simulation session of interconnected SEIRAH: city_0,1,2,3 and CBD are
+built once and kept in memory, days are run on them one by one. Nothing
+runs at import, so sweeps, ensembles and the prediction stage can drive
+one model in process instead of starting SEIRAH_main.py again.
+
+Usage:
+    import SEIRAH_main
+    sim = SEIRAH_main.session(seed=2020)    # parameters of SEIRAH_main.py
+    sim.run(60)                             # days 0..59, calibrated as SEIRAH_main.py
+    sim.results.table(SEIRAH_Store.SHUTO)   # Daily_Result_ALL
+
+    sim.step(day)        one day: commuters, beta_t_S[day], SEIRAH_SW, counts.
+    sim.calibrate(day)   beta_t of the day (find_beta_t), set from day on.
+    sim.snapshot()       state of the session (SEIRAH_Checkpoint keys), a copy
+                         of node state, topology is shared with the session.
+    sim.restore(state)   back to a snapshot, a checkpoint or final_state.pkl.
+
+Note:
+    Random streams are the module ones (random, SEIRAH_CSR.rng), seeded when
+    the networks are built. A session made from a state is not reseeded.
+    Days are run in order, a step draws the commuters of its day once.
+"""
+
+import copy as co
+import datetime
+from random import sample
+import numpy as np
+import pandas as pd
+import networkx as nx
+import SEIRAH_SW as SEIRAH_SW
+import SEIRAH_SW_F as SEIRAH_SW_F
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_Gen as SEIRAH_Gen
+import SEIRAH_Cache as SEIRAH_Cache
+import SEIRAH_Roster as SEIRAH_Roster
+import SEIRAH_Data as SEIRAH_Data
+import SEIRAH_Beta as SEIRAH_Beta
+import SEIRAH_Store as SEIRAH_Store
+
+# State of a session, as saved by SEIRAH_Checkpoint (HANDOFF_VARS are a part).
+STATE = ['city_0', 'city_1', 'city_2', 'city_3', 'CBD', 'roster', 'Com_index',
+         'beta_t_S', 'results', 'Daily_Result_sum', 'para_N_0', 'para_N_1',
+         'para_N_2', 'para_N_3', 'CBD_N', 'CBD_k', 'CBD_p']
+
+# Networks of STATE. Their topology is never copied by snapshot().
+NETWORKS = ['city_0', 'city_1', 'city_2', 'city_3', 'CBD']
+
+"""
+Network Generation and Initialization.
+The newman_watts_strogatz_graph as following official document.
+https://networkx.github.io/documentation/stable/_modules/networkx/generators/random_graphs.html#newman_watts_strogatz_graph
+"""
+def G_gene(N,k,p,expo,infe,asym,hosp,reco,nwk_gen='nx',nwk_cache=False,
+           nwk_cache_bytes=SEIRAH_Cache.MAX_BYTES):
+    if nwk_cache:
+        # Cached topology, initial status drawn as below (nx) or as SEIRAH_Gen.
+        C = SEIRAH_Cache.topology(nwk_gen,N,k,p,2020,max_bytes=nwk_cache_bytes)
+        return SEIRAH_Gen.set_initial(C,expo,infe,asym,hosp,reco,
+                                      draw='random' if nwk_gen == 'nx' else 'numpy')
+    if nwk_gen == 'numpy':
+        return SEIRAH_Gen.G_gene(N,k,p,expo,infe,asym,hosp,reco,seed=2020)
+
+    G = nx.newman_watts_strogatz_graph(N,k,p,seed=2020);
+
+    for i in G.nodes():
+        G.nodes[i]['status'] = 'susc'  #Initialize all nodes as susc.
+        G.nodes[i]['S_1stday'] = 0  #Set initial date(day) to S nodes.
+        G.nodes[i]['E_1stday'] = 0
+        G.nodes[i]['I_1stday'] = 0
+        G.nodes[i]['A_1stday'] = 0
+        G.nodes[i]['H_1stday'] = 0
+        G.nodes[i]['R_1stday'] = 0
+        G.nodes[i]['Infe_other'] = 0  #Count for Rt calculating.
+
+    for i in G.edges():
+        G.edges[i]['weight'] = 1   #Initialize all edges weight = 1
+
+    """
+    Initial G. SEIRAH status
+    """
+    samp_sum = expo+infe+asym+hosp+reco   #total number of samples
+
+
+    # Random sample nodes from G.
+    random_n = sample(list(G.nodes()), samp_sum)  #use sample function
+
+    # nodes lists of each status. Randomly chose(clip) from random_n list.
+    node_e = random_n[0:expo]
+
+    a = expo + infe
+    node_i = random_n[expo:a]
+
+    b = a + asym
+    node_a = random_n[a:b]
+
+    c = b + hosp
+    node_h = random_n[b:c]
+
+    d = c + reco
+    node_r = random_n[c:d]
+
+    # Divide samples by status inputed numbers. Assign status except S.
+    # Record *_1stday. S node does not need to record.
+    for i in node_e:
+        G.nodes[i]['status'] = 'expo'
+        G.nodes[i]['S_1stday'] = 0 #Initial E to replace S status.
+        G.nodes[i]['E_1stday'] = 0
+        G.nodes[i]['I_1stday'] = 0
+        G.nodes[i]['A_1stday'] = 0
+        G.nodes[i]['H_1stday'] = 0
+        G.nodes[i]['R_1stday'] = 0
+
+    for i in node_i:
+        G.nodes[i]['status'] = 'infe'
+        G.nodes[i]['S_1stday'] = 0 #Initial E to replace S status.
+        G.nodes[i]['E_1stday'] = 0
+        G.nodes[i]['I_1stday'] = 0
+        G.nodes[i]['A_1stday'] = 0
+        G.nodes[i]['H_1stday'] = 0
+        G.nodes[i]['R_1stday'] = 0
+
+    for i in node_a:
+        G.nodes[i]['status'] = 'asym'
+        G.nodes[i]['S_1stday'] = 0 #Initial E to replace S status.
+        G.nodes[i]['E_1stday'] = 0
+        G.nodes[i]['I_1stday'] = 0
+        G.nodes[i]['A_1stday'] = 0
+        G.nodes[i]['H_1stday'] = 0
+        G.nodes[i]['R_1stday'] = 0
+
+    for i in node_h:
+        G.nodes[i]['status'] = 'hosp'
+        G.nodes[i]['S_1stday'] = 0 #Initial E to replace S status.
+        G.nodes[i]['E_1stday'] = 0
+        G.nodes[i]['I_1stday'] = 0
+        G.nodes[i]['A_1stday'] = 0
+        G.nodes[i]['H_1stday'] = 0
+        G.nodes[i]['R_1stday'] = 0
+
+    for i in node_r:
+        G.nodes[i]['status'] = 'reco'
+        G.nodes[i]['S_1stday'] = 0 #Initial E to replace S status.
+        G.nodes[i]['E_1stday'] = 0
+        G.nodes[i]['I_1stday'] = 0
+        G.nodes[i]['A_1stday'] = 0
+        G.nodes[i]['H_1stday'] = 0
+        G.nodes[i]['R_1stday'] = 0
+
+    # update G edges weight. node_h needs update link weight 1=>0
+    for i in node_h:
+        for nbr in G[i]:
+            G.edges[i, nbr]['weight'] = 0
+
+    return G
+
+def CBD_gene(N,k,p,nwk_gen='nx',nwk_cache=False,nwk_cache_bytes=SEIRAH_Cache.MAX_BYTES):
+    #Commuting network. nx.draw(H,pos=nx.circular_layout(H))
+    if nwk_cache:
+        return SEIRAH_Cache.topology(nwk_gen,N,k,p,2980,max_bytes=nwk_cache_bytes)
+    if nwk_gen == 'numpy':
+        return SEIRAH_Gen.nws_graph(N,k,p,seed=2980)
+
+    CBD = nx.newman_watts_strogatz_graph(N,k,p,seed=2980)
+    for i in CBD.nodes():
+        CBD.nodes[i]['Infe_other'] = 0  #Count for Rt calculating.
+
+    for i in CBD.edges():
+        CBD.edges[i]['weight'] = 1
+    return CBD
+
+"""
+Nodes mapping function. Isolation phase of SEIRAH_CSR, on either backend.
+"""
+def edge_weight_0(nwk):
+    return SEIRAH_CSR.edge_weight_0(nwk)
+
+def edge_weight_1(nwk):
+    return SEIRAH_CSR.edge_weight_1(nwk)
+
+"""
+Simulate β by H(t1,t2,...t7). MSE method.
+Runs on the given networks, no copy. Caller discards the dry run (find_beta_t).
+__day: time stamp of the counts, the calibrated day.
+Isolation phases stay as the candidate found them: the day loop switches
+them with edge_weight_0/1, the forecast of the paper never did (its
+SEIRAH_SW_F copies left them on the discarded networks). Same on both backends.
+"""
+
+def beta_leastsquare(beta_t,__day,__tau,__sw_batch,__CBD_s,__city_0,__city_1,__city_2,__city_3,
+                     __Com_index,__real_H):
+
+    CBD_s=__CBD_s
+
+    citys = [__city_0,__city_1,__city_2,__city_3]
+
+    pred_H = np.zeros((7,8))
+
+    for d in range(7):  # Day: from 0 to 6
+        for i in range(4):  #all 4 cities in tau[0] TimeZone
+            __city_for_func = citys[i] # prepare which city to do.
+            citys[i] = SEIRAH_SW_F.SEIRAH_SW_F(__city_for_func,beta_t,__tau[0],__sw_batch)
+
+        #Interconnect_City2CBD()
+        for i in range(4):
+            SEIRAH_CSR.interconnect(citys[i], __Com_index[i][0], CBD_s, __Com_index[i][1])
+
+        # SEIRAH process of CBD in a certain day.
+        CBD_s = SEIRAH_SW_F.SEIRAH_SW_F(CBD_s,beta_t, __tau[1],__sw_batch)
+
+        # SEIRAH precess of cities in working TimeZone of a certain day.
+        for i in range(4):  #all 4 cities in TimeZone tau[1]
+            __city_for_func = citys[i] # prepare which city to do.
+            citys[i] = SEIRAH_SW_F.SEIRAH_SW_F(__city_for_func,beta_t,__tau[1],__sw_batch)
+
+        #Interconnect_CBD2City()
+        for i in range(4):
+            SEIRAH_CSR.interconnect(CBD_s, __Com_index[i][1], citys[i], __Com_index[i][0])
+
+        #Output daily status. Stoped S counting.
+        __Daily_Result_sum = np.array([0,0,0,0,0,0,0,0]) # S, E, I, R, A, H, Rt, Tt
+
+        for i in range(4):
+            __Daily_Result_city = Count_status(__day,citys[i])
+            __Daily_Result_sum = __Daily_Result_sum + __Daily_Result_city
+
+        # H of the week, in the layout of __real_H.
+        pred_H[d,5] = __Daily_Result_sum[5]
+
+    diff=(__real_H-pred_H)**2
+
+    sum_diff=0
+
+    for i in range(1,7):
+        sum_diff = sum_diff + diff[i,5]
+
+    sum_diff_s=sum_diff
+
+    return sum_diff_s
+
+"""
+Count statuses of SEIRAH in target network. Daily data. NOT for TimeZone.
+Rt, Tt per H (SEIRAH_main.py), or per new H of the day with __per_new_H
+(SEIRAH_PredictEnding.py).
+"""
+def Count_status(__time_stamp, __nwk, __per_new_H=False):
+
+    # CSR_Graph keeps counters and an index of new H. No scan, S is counted.
+    if isinstance(__nwk, SEIRAH_CSR.CSR_Graph):
+        num, count_Infe_other, count_T, count_H = SEIRAH_CSR.count_status(__time_stamp, __nwk)
+        num_H = num[SEIRAH_CSR.HOSP]
+        per = count_H if __per_new_H else num_H
+        if per == 0 or num_H == 0:  #Avoid error while H=0
+            Rt = Tt = 0
+        else:
+            Rt = count_Infe_other / per
+            Tt = count_T / per
+        return [num[SEIRAH_CSR.SUSC], num[SEIRAH_CSR.EXPO], num[SEIRAH_CSR.INFE],
+                num[SEIRAH_CSR.RECO], num[SEIRAH_CSR.ASYM], num_H, Rt, Tt]
+
+    num_S = num_E = num_I = num_R = num_A = num_H = 0
+    count_Infe_other = count_T = count_H = 0
+    Rt = Tt = 0
+
+    for i in range(__nwk.number_of_nodes()):
+# S is big number. No count to save computing time.
+#        if nwk.nodes[i]['status'] == 'susc':
+#            num_S = num_S + 1
+#           continue
+
+        if __nwk.nodes[i]['status'] == 'expo':
+            num_E = num_E + 1
+            #continue
+        if __nwk.nodes[i]['status'] == 'infe':
+            num_I = num_I + 1
+            #continue
+        if __nwk.nodes[i]['status'] == 'reco':
+            num_R = num_R + 1
+            #continue
+        if __nwk.nodes[i]['status'] == 'asym':
+            num_A = num_A + 1
+            #continue
+        if __nwk.nodes[i]['status'] == 'hosp':
+            num_H = num_H + 1
+
+        #Filter out new H, to count Rt, Tt
+        if __nwk.nodes[i]['H_1stday'] == __time_stamp:
+            count_H = count_H + 1
+            count_Infe_other = count_Infe_other + __nwk.nodes[i]['Infe_other']
+            #Count how many days from E to H
+            count_T = count_T + __nwk.nodes[i]['H_1stday'] - __nwk.nodes[i]['E_1stday']
+
+    per = count_H if __per_new_H else num_H
+    if per == 0 or num_H == 0:  #Avoid error while H=0
+        Rt = Tt = 0
+    else:
+        Rt = count_Infe_other / per
+        Tt = count_T / per
+        #Tt = format(Rt / beta_t,'.2f')
+
+    __Count_status = [num_S, num_E, num_I, num_R, num_A, num_H, Rt, Tt]
+
+    return __Count_status
+
+
+class Simulation:
+
+    def __init__(self, para=None, tau=(0.5, 0.5), day_n=None, CBD_k=8, CBD_p=0.05,
+                 beta_t_S=None, seed=None, state=None, day=0,
+                 nwk_backend='csr', sw_batch=False, nwk_gen='nx', nwk_cache=False,
+                 nwk_cache_bytes=SEIRAH_Cache.MAX_BYTES, beta_search='bisect',
+                 beta_workers=4, beta_k=4, beta_crn=False, crn_seed=2020, per_new_H=False,
+                 verbose=True):
+        # para: parameter sets of city_0,1,2,3 (N, k, p, NCom, expo, ...).
+        # state: snapshot or checkpoint state to continue, nothing is built.
+        # day_n: days of the run (calibration), None: 60, or those of the state.
+        # day: next day to run. per_new_H: Rt, Tt of Count_status per new H.
+        self.tau = tau
+        self.day = day
+        self.nwk_backend = nwk_backend
+        self.sw_batch = sw_batch
+        self.nwk_gen = nwk_gen
+        self.nwk_cache = nwk_cache
+        self.nwk_cache_bytes = nwk_cache_bytes
+        self.beta_search = beta_search
+        self.beta_workers = beta_workers
+        self.beta_k = beta_k
+        self.beta_crn = beta_crn
+        self.crn_seed = crn_seed
+        self.per_new_H = per_new_H
+        self.verbose = verbose
+
+        # Dataset, parsed once.
+        self.data = SEIRAH_Data.load()
+        self.Com_day = None   # day of the current commuters
+
+        if para is not None:
+            for i in range(4):
+                setattr(self, 'para_N_%d' % i, co.copy(para[i]))
+            self.para = [co.copy(p) for p in para]   # NCom of the day
+            self.CBD_N = sum(p['NCom'] for p in para)
+            self.CBD_k = CBD_k
+            self.CBD_p = CBD_p
+
+        if state is not None:
+            self.restore(state)
+            self.day_n = len(self.beta_t_S) if day_n is None else day_n
+            return
+
+        self.day_n = 60 if day_n is None else day_n
+        if beta_t_S is None:
+            beta_t_S = pd.Series(0.1,np.arange(self.day_n))
+        self.beta_t_S = beta_t_S.copy()
+
+        if seed is not None:
+            SEIRAH_CSR.seed(seed)
+        self.build()
+
+        # Daily results: day x (city_0,1,2,3, Shuto) x (S,E,I,R,A,H,Rt,Tt), set by step.
+        self.results = SEIRAH_Store.Store(self.day_n)
+
+    @property
+    def cities(self):
+        return [self.city_0, self.city_1, self.city_2, self.city_3]
+
+    def build(self):
+        '''
+        Initialize commuting network, then city_0,1,2,3.
+        city_0 is center, the others are outskirts.
+        '''
+        opt = (self.nwk_gen, self.nwk_cache, self.nwk_cache_bytes)
+        self.CBD = CBD_gene(self.CBD_N, self.CBD_k, self.CBD_p, *opt)
+        if self.nwk_backend == 'csr':
+            self.CBD = SEIRAH_CSR.from_nx(self.CBD)
+
+        for i in range(4):
+            para = getattr(self, 'para_N_%d' % i)
+            city = G_gene(para['N'],para['k'],para['p'],para['expo'],
+                          para['infe'],para['asym'],para['hosp'],para['reco'],*opt)
+            if self.nwk_backend == 'csr':
+                city = SEIRAH_CSR.from_nx(city)
+            setattr(self, 'city_%d' % i, city)
+
+        '''
+        Choose cityCom（通勤者）nodes. Roster of city_0,1,2,3 with 'NCom' nodes each.
+        Later it is resampled every day, scaled by CR(commuting ratio).
+        '''
+        self.roster = SEIRAH_Roster.Roster(self.cities, [p['NCom'] for p in self.para])
+        self.Com_index = self.roster.resample(1)
+
+        # Copy commting nodes 'status' to CBD nodes.
+        for i, city in enumerate(self.cities):
+            SEIRAH_CSR.interconnect(city, self.Com_index[i][0], self.CBD, self.Com_index[i][1])
+
+        # While generated, all CBD.edges as 'weight'=1
+        # Initialize 'hosp' status nodes with nbr edges of 'weight'=0
+        edge_weight_0(self.CBD)
+
+        #Initial Status. S,E,I,R,A,H,Rt,Tt
+        self.Daily_Result_sum = self.count(0)
+        if self.verbose:
+            print()
+
+    def commute(self, day, CR=None):
+        # Commuters of the day, yesterday's are cleared. Copy their status to CBD nodes.
+        if CR is None:
+            CR = self.data.CR_Shuto[day]
+        for para, para_N in zip(self.para, self.para_N):
+            para['NCom'] = int(para_N['NCom']*CR)
+
+        self.Com_index = self.roster.resample(CR)
+        for i, city in enumerate(self.cities):
+            SEIRAH_CSR.interconnect(city, self.Com_index[i][0], self.CBD, self.Com_index[i][1])
+
+        edge_weight_0(self.CBD)
+        self.Com_day = day
+
+    @property
+    def para_N(self):
+        return [self.para_N_0, self.para_N_1, self.para_N_2, self.para_N_3]
+
+    def calibrating(self, day):
+        # Days of find_beta_t, as SEIRAH_main.py: a whole week of data ahead.
+        return day > 0 and day < (7*int(self.day_n/7))
+
+    def calibrate(self, day):
+        # beta_t of the day on today's networks, beta_t_S from day on.
+        if self.Com_day != day:
+            self.commute(day)
+
+        # find_beta_t restores the networks in place, no copy needed here.
+        if self.verbose:
+            print(datetime.datetime.now())
+
+        beta_t = self.find_beta_t(day, self.beta_t_S.iloc[day])
+
+        if self.verbose:
+            print(datetime.datetime.now())
+
+        self.beta_t_S.iloc[day:self.day_n] = beta_t
+
+        if self.verbose:
+            print('day:',day)
+            print('beta_t:',beta_t)
+        return beta_t
+
+    def step(self, day=None, beta_t=None, CR=None):
+        # One day. beta_t None: calibrated on calibration days, else beta_t_S[day].
+        # CR: commuting ratio of the day, None: CR_Shuto of the dataset.
+        if day is None:
+            day = self.day
+        if self.Com_day != day:
+            self.commute(day, CR)
+
+        if beta_t is None:
+            if self.calibrating(day):
+                beta_t = self.calibrate(day)
+            elif day in self.beta_t_S.index:
+                beta_t = self.beta_t_S[day]
+            else:
+                beta_t = self.beta_t_S.iloc[-1]   # after day_n, the last beta_t
+        self.beta_t_S[day] = beta_t
+
+        tau = self.tau
+        for city in self.cities:  #all 4 cities in tau[0] TimeZone
+            SEIRAH_SW.SEIRAH_SW(day,city,beta_t,tau[0],self.sw_batch)
+
+            # Finish tau[0]:life infection. Prepare for tau[1]:life+CBD
+            edge_weight_0(city)
+
+        #Interconnect_City2CBD()
+        for i, city in enumerate(self.cities):
+            SEIRAH_CSR.interconnect(city, self.Com_index[i][0], self.CBD, self.Com_index[i][1])
+
+        # SEIRAH process of CBD in a certain day.
+        SEIRAH_SW.SEIRAH_SW(day,self.CBD,beta_t, tau[1],self.sw_batch)
+
+        # SEIRAH precess of cities in working TimeZone of a certain day.
+        for city in self.cities:  #all 4 cities in TimeZone tau[1]
+            SEIRAH_SW.SEIRAH_SW(day,city,beta_t,tau[1],self.sw_batch)
+            edge_weight_1(city)
+
+        #Interconnect_CBD2City()
+        for i, city in enumerate(self.cities):
+            SEIRAH_CSR.interconnect(self.CBD, self.Com_index[i][1], city, self.Com_index[i][0])
+
+        self.Daily_Result_sum = self.count(day, store=True)
+        self.day = day + 1
+        return self.Daily_Result_sum
+
+    def count(self, day, store=False):
+        #Output daily status. Stoped S counting.
+        Daily_Result_sum = np.array([0,0,0,0,0,0,0,0]) # S, E, I, R, A, H, Rt, Tt
+
+        for i, city in enumerate(self.cities):
+            Daily_Result_city = Count_status(day,city,self.per_new_H)
+            Daily_Result_sum = Daily_Result_sum + Daily_Result_city
+
+            if self.verbose:
+                print('city_', i, Daily_Result_city)
+            if store:
+                self.results.set(day, i, Daily_Result_city)
+
+        if self.verbose:
+            print('day:', day, 'Total', Daily_Result_sum)
+        if store:
+            self.results.set(day, SEIRAH_Store.SHUTO, Daily_Result_sum)
+        return Daily_Result_sum
+
+    def run(self, days=None):
+        # Days from the next one to days-1 (day_n). Results of the session.
+        if days is None:
+            days = self.day_n
+        for day in range(self.day, days):
+            self.step(day)
+        return self.results
+
+    def snapshot(self, copy=True):
+        # State as STATE. copy=False: the live objects, as pickled by checkpoints.
+        # copy=True: node state of the networks (SEIRAH_CSR.snapshot) and the
+        # commuters of the roster, topology is shared. Restored in place.
+        state = {k: getattr(self, k) for k in STATE}
+        if copy:
+            state = {k: SEIRAH_CSR.snapshot(v) if k in NETWORKS else
+                        v.snapshot() if k == 'roster' else co.deepcopy(v)
+                     for k, v in state.items()}
+        return state
+
+    def restore(self, state, day=None, copy=True):
+        # Keys of STATE that the state has (older checkpoints keep no para_N_*).
+        # Node state of a snapshot() goes back into the networks of this session.
+        # Objects of a checkpoint are taken, copy=True: a copy, so the state is
+        # not changed by later steps and can be restored again.
+        state = {k: state[k] for k in STATE if k in state}
+        nodes = {k: v for k, v in state.items()
+                 if k in NETWORKS and not isinstance(v, (SEIRAH_CSR.CSR_Graph, nx.Graph))
+                 or k == 'roster' and not isinstance(v, SEIRAH_Roster.Roster)}
+        objects = {k: v for k, v in state.items() if k not in nodes}
+        if copy:
+            objects = co.deepcopy(objects)
+        if nodes and not hasattr(self, 'CBD'):
+            raise ValueError('snapshot of node state, restore it into its own session')
+
+        for k, v in nodes.items():
+            if k == 'roster':
+                self.roster.restore(v)
+            else:
+                SEIRAH_CSR.restore(getattr(self, k), v)
+        for k, v in objects.items():
+            setattr(self, k, v)
+        if 'para_N_0' in state:
+            self.para = [co.copy(p) for p in self.para_N]
+        if day is not None:
+            self.day = day
+        self.Com_day = None
+
+    """
+    Search for optimal beta_t. Step of Algorithm2.
+    """
+    def find_beta_t(self,day,beta_t):
+
+        eps=0.01  #episilon in Algorithm2
+        beta_p=beta_t
+
+        # H_Shuto of 7 days from day, precomputed by SEIRAH_Data.
+        real_H = self.data.window(day)
+
+        # Every candidate is a dry run on today's networks, in place, and its
+        # changes are discarded after it. Commuter index is read only.
+        nwks = [self.CBD] + self.cities
+
+        def D_beta(beta):
+            dry_runs = [SEIRAH_CSR.dry_run(nwk) for nwk in nwks]
+            try:
+                return beta_leastsquare(beta,day,self.tau,self.sw_batch,*nwks,
+                                        self.Com_index,real_H)
+            finally:
+                for dry in dry_runs:
+                    dry.discard()
+
+        # Common random numbers: every candidate of this day on the same stream.
+        objective = D_beta
+        if self.beta_crn:
+            objective = SEIRAH_Beta.Common_Random(D_beta, SEIRAH_Beta.day_seed(self.crn_seed, day))
+
+        # SSE of the betas evaluated today, whatever the search. Counts simulations.
+        objective = SEIRAH_Beta.Memo(objective)
+
+        A = 0  #beta_t in [0,1]
+        B = 1
+
+        try:
+            if self.beta_search == 'kary':
+                beta_p = SEIRAH_Beta.kary_search(objective, A, B, eps, self.beta_k, self.beta_workers)[0]
+
+            elif self.beta_search == 'golden':
+                beta_p = SEIRAH_Beta.golden_search(objective, A, B, eps)[0]
+
+            else:
+                beta_p = SEIRAH_Beta.bisect_search(objective, A, B, eps, beta_p)[0]
+
+        except Exception as re:
+            print("Terminated by abnormal network topology")
+            print("Error Message:",re)
+
+        if self.verbose:
+            print('beta_t evaluations:',objective.evaluations)
+
+        return beta_p
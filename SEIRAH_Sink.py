@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Streaming sink of daily results, one row per day and table (city_0,1,2,3
+and Shuto). Rows are buffered and written every 'batch' days, so a crashed
+run keeps the days before its last flush and a running one can be watched.
+
+    'csv': output_city_*.csv, output_Shuto.csv, the columns SEIRAH_PredictEnding.py
+        reads: Date, Day, *_beta_t, *_S, ..., *_Tt_NWK, *_realH, *_N, *_k, *_p, *_NCom.
+    'col': output_city_*.col/, a raw float64 file per numeric column plus 'day'
+        (row of SEIRAH_Data), appended in place. Read by load_columns.
+    'both': csv and col.
+    'none': nothing written, as runs of a results cube (SEIRAH_Cube).
+
+Note:
+    'NaN' cells of the csv are nan in col files.
+    start > 0 (resumed run) keeps the first start rows already written.
+"""
+
+import os
+import csv as cs
+import json
+import numpy as np
+
+COLUMNS = ['beta_t', 'S', 'E', 'I', 'R', 'A', 'H', 'Rt_NWK', 'Tt_NWK', 'realH', 'N', 'k', 'p']
+
+def header(name, ncom='NCom'):
+    return ['Date', 'Day'] + [name + '_' + c for c in COLUMNS + [ncom]]
+
+def row(date, weekday, beta_t, result, real_H, N, k, p, NCom):
+    # result: S, E, I, R, A, H, Rt, Tt of Count_status. S = N-E-I-R-A-H.
+    result = np.asarray(result, dtype=np.float64)
+    return (date, weekday, beta_t,
+            (N-result[1]-result[2]-result[3]-result[4]-result[5]),
+            result[1], result[2], result[3], result[4], result[5],
+            result[6], result[7], real_H, N, k, p, NCom)
+
+def _float(x):
+    try:
+        return float(x)
+    except ValueError:
+        return np.nan
+
+
+class Sink:
+
+    def __init__(self, files, names, fmt='csv', batch=7, start=0, ncom='NCom'):
+        if fmt not in ('csv', 'col', 'both', 'none'):
+            raise ValueError('unknown sink format: %s' % fmt)
+        self.files = files
+        self.names = names
+        self.batch = batch
+        self.buffer = []   # (day, rows of the day)
+        self.csv = []
+        self.col = []
+
+        for file, name in zip(files, names):
+            head = header(name, ncom)
+            if fmt in ('csv', 'both'):
+                self.csv.append(_open_csv(file, head, start))
+            if fmt in ('col', 'both'):
+                self.col.append(_open_col(os.path.splitext(file)[0] + '.col', head, start))
+
+    def write(self, day, rows):
+        # rows: one row per file, as row().
+        self.buffer.append((day, rows))
+        if len(self.buffer) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        for t, f in enumerate(self.csv):
+            cs.writer(f).writerows([rows[t] for _, rows in self.buffer])
+            f.flush()
+        for t, cols in enumerate(self.col):
+            x = np.array([[day] + [_float(v) for v in rows[t][2:]] for day, rows in self.buffer])
+            for j, f in enumerate(cols):
+                x[:, j].tofile(f)
+                f.flush()
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        for f in self.csv:
+            f.close()
+        for cols in self.col:
+            for f in cols:
+                f.close()
+        self.csv = []
+        self.col = []
+
+def _open_csv(file, head, start):
+    keep = []
+    if start > 0 and os.path.exists(file):
+        with open(file, newline='') as f:
+            keep = list(cs.reader(f))[1:start + 1]
+    f = open(file, 'w', newline='')
+    w = cs.writer(f)
+    w.writerow(head)
+    w.writerows(keep)
+    f.flush()
+    return f
+
+def _open_col(path, head, start):
+    # 'day' and the numeric columns, Date and Day are rows of SEIRAH_Data.
+    names = ['day'] + head[2:]
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, 'columns.json'), 'w') as f:
+        json.dump({'columns': names, 'dtype': '<f8'}, f)
+
+    cols = []
+    for name in names:
+        f = open(os.path.join(path, name + '.f8'), 'ab' if start > 0 else 'wb')
+        f.truncate(8*start if start > 0 else 0)
+        f.seek(0, os.SEEK_END)
+        cols.append(f)
+    return cols
+
+def load_columns(path, mmap=True):
+    # {column: array} of a .col directory, mapped read only.
+    with open(os.path.join(path, 'columns.json')) as f:
+        meta = json.load(f)
+    cols = {}
+    for name in meta['columns']:
+        file = os.path.join(path, name + '.f8')
+        if mmap and os.path.getsize(file) > 0:
+            cols[name] = np.memmap(file, dtype=meta['dtype'], mode='r')
+        else:
+            cols[name] = np.fromfile(file, dtype=meta['dtype'])
+    return cols
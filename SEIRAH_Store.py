@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Result store of the day loop: one float64 array (days x tables x metrics),
+tables city_0,1,2,3 and Shuto, metrics S, E, I, R, A, H, Rt, Tt of
+Count_status. Allocated once for the known days. An open-ended run (as
+SEIRAH_PredictEnding.py) doubles the array when a day does not fit, so
+each day costs one row, not a copy of the history.
+
+    results.set(day, i, Daily_Result_city)
+    results.table(i): day x metrics, as cityresult_* (Shuto: Daily_Result_ALL).
+    results['H'], results.H: day x tables.
+    results.array: day x tables x metrics of the days set.
+
+Note:
+    Days not set read as 0.
+"""
+
+import numpy as np
+
+METRICS = ['S', 'E', 'I', 'R', 'A', 'H', 'Rt', 'Tt']
+TABLES = ['city_0', 'city_1', 'city_2', 'city_3', 'Shuto']
+SHUTO = 4
+
+
+class Store:
+
+    def __init__(self, days=64, tables=TABLES, metrics=METRICS):
+        self.tables = list(tables)
+        self.metrics = list(metrics)
+        self.data = np.zeros((max(days, 1), len(self.tables), len(self.metrics)))
+        self.n = 0   # days set, 0..n-1
+
+    def __len__(self):
+        return self.n
+
+    def grow(self, days):
+        # Capacity of at least 'days', doubled.
+        cap = len(self.data)
+        if days <= cap:
+            return
+        while cap < days:
+            cap = cap*2
+        data = np.zeros((cap,) + self.data.shape[1:])
+        data[:len(self.data)] = self.data
+        self.data = data
+
+    def set(self, day, table, result):
+        self.grow(day + 1)
+        self.data[day, table] = result
+        self.n = max(self.n, day + 1)
+
+    @property
+    def array(self):
+        return self.data[:self.n]
+
+    def table(self, table):
+        if isinstance(table, str):
+            table = self.tables.index(table)
+        return self.data[:self.n, table]
+
+    def __getitem__(self, metric):
+        return self.data[:self.n, :, self.metrics.index(metric)]
+
+    def __getattr__(self, name):
+        # results.S, results.E, ... as results['S'].
+        if name in METRICS:
+            return self[name]
+        raise AttributeError(name)
@@ -0,0 +1,35 @@
+# SEIRAH_*.py modules are flat scripts of the repository root.
+import os
+import sys
+import random
+import networkx as nx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# N, k, p, expo, infe, asym, hosp of a small city.
+CITY = (400, 4, 0.1, 20, 5, 5, 2)
+
+@pytest.fixture
+def city():
+    # Small city as G_gene of SEIRAH_main.py, networkx backend.
+    def city(seed=1):
+        N, k, p, expo, infe, asym, hosp = CITY
+        random.seed(seed)
+        G = nx.newman_watts_strogatz_graph(N, k, p, seed=2020)
+        for i in G.nodes():
+            G.nodes[i]['status'] = 'susc'
+            for a in ['S_1stday', 'E_1stday', 'I_1stday', 'A_1stday', 'H_1stday',
+                      'R_1stday', 'Infe_other']:
+                G.nodes[i][a] = 0
+        for e in G.edges():
+            G.edges[e]['weight'] = 1
+
+        status = ['expo']*expo + ['infe']*infe + ['asym']*asym + ['hosp']*hosp
+        for i, s in zip(random.sample(list(G.nodes()), len(status)), status):
+            G.nodes[i]['status'] = s
+            if s == 'hosp':
+                for nbr in G[i]:
+                    G.edges[i, nbr]['weight'] = 0
+        return G
+    return city
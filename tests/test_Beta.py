@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""
+Searches of SEIRAH_Beta on a synthetic objective, minimum at BETA.
+
+Usage:
+    python -m pytest -q
+"""
+
+import random
+import pytest
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_Beta as SEIRAH_Beta
+
+BETA = 0.37
+EPS = 0.01
+
+def sse(beta):
+    return (beta - BETA)**2
+
+def noisy(beta):
+    # SSE of a stochastic run: noise from the random stream.
+    return (beta - BETA)**2 + 0.001*random.random()
+
+def test_bisect_search():
+    beta, n = SEIRAH_Beta.bisect_search(sse, 0, 1, EPS, 0.1)
+    assert beta == pytest.approx(BETA, abs=2*EPS)
+
+    # Both ends every round, the end kept is not simulated again.
+    memo = SEIRAH_Beta.Memo(sse)
+    assert SEIRAH_Beta.bisect_search(memo, 0, 1, EPS, 0.1) == (beta, n)
+    assert n == memo.evaluations == len(memo.table)
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_kary_search(workers):
+    random.seed(1)
+    beta, n = SEIRAH_Beta.kary_search(sse, 0, 1, EPS, 4, workers)
+    assert beta == pytest.approx(BETA, abs=EPS)
+    # End points once, then k per round.
+    assert (n - 2) % 4 == 0
+
+def test_kary_search_workers_agree():
+    # One seed per candidate from the main stream, not per worker.
+    results = []
+    for workers in [1, 2]:
+        random.seed(1)
+        results.append(SEIRAH_Beta.kary_search(noisy, 0, 1, EPS, 4, workers))
+        results.append(random.random())
+    assert results[:2] == results[2:]
+
+def test_golden_search():
+    beta, n = SEIRAH_Beta.golden_search(sse, 0, 1, EPS)
+    assert beta == pytest.approx(BETA, abs=EPS)
+    # One new point per round: 2 + rounds of (1 - 0.618^rounds) < EPS.
+    assert n <= 2 + 10
+
+def test_memo_shared_by_searches():
+    memo = SEIRAH_Beta.Memo(sse)
+    _, n = SEIRAH_Beta.golden_search(memo, 0, 1, EPS)
+    _, m = SEIRAH_Beta.golden_search(memo, 0, 1, EPS)
+    assert m == 0 and memo.evaluations == n
+
+def test_common_random():
+    random.seed(4)
+    state = random.getstate()
+    f = SEIRAH_Beta.Common_Random(noisy, SEIRAH_Beta.day_seed(2020, 3))
+
+    # Same stream for every candidate, the main stream is left as it was.
+    assert f(0.2) == f(0.2)
+    assert f(0.2) - sse(0.2) == f(0.5) - sse(0.5)
+    assert random.getstate() == state
+    assert SEIRAH_Beta.day_seed(2020, 3) != SEIRAH_Beta.day_seed(2020, 4)
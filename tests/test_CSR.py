@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Small-N checks of the CSR engine against the networkx one.
+
+Usage:
+    python -m pytest -q
+"""
+
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_SW as SEIRAH_SW
+import SEIRAH_SW_F as SEIRAH_SW_F
+import SEIRAH_Roster as SEIRAH_Roster
+
+def days(nwk, n, beta_t=0.3, tau=0.5, phases=False):
+    # Both tau phases of n days, as the day loop of a city.
+    for day in range(1, n + 1):
+        SEIRAH_SW.SEIRAH_SW(day, nwk, beta_t, tau)
+        if phases:
+            SEIRAH_CSR.edge_weight_0(nwk)
+        SEIRAH_SW.SEIRAH_SW(day, nwk, beta_t, tau)
+        if phases:
+            SEIRAH_CSR.edge_weight_1(nwk)
+
+def state(nwk):
+    # Node status and attributes, of either backend.
+    G = SEIRAH_CSR.to_nx(nwk)
+    return [[G.nodes[i][a] for a in ['status'] + SEIRAH_CSR.NODE_ATTR] for i in range(len(G))]
+
+def test_csr_kernel_matches_nx(city):
+    G = city()
+    C = SEIRAH_CSR.from_nx(G)
+
+    SEIRAH_CSR.seed(5)
+    days(G, 7)
+    SEIRAH_CSR.seed(5)
+    days(C, 7)
+
+    assert state(G) == state(C)
+
+def test_dry_run_discard_and_commit(city):
+    for backend in [SEIRAH_CSR.to_nx, SEIRAH_CSR.from_nx]:
+        nwk, before = backend(city()), backend(city())
+
+        dry = SEIRAH_CSR.dry_run(nwk)
+        days(nwk, 3)
+        dry.discard()
+        assert state(nwk) == state(before)
+
+        # Kept, as the same days without a dry run.
+        SEIRAH_CSR.seed(2)
+        dry = SEIRAH_CSR.dry_run(nwk)
+        days(nwk, 3)
+        dry.commit()
+        SEIRAH_CSR.seed(2)
+        days(before, 3)
+        assert state(nwk) == state(before) != state(backend(city()))
+
+def test_forecast_dry_run_matches_nx(city):
+    G = city()
+    C = SEIRAH_CSR.from_nx(G)
+    status = C.status.copy()
+
+    SEIRAH_CSR.seed(3)
+    F_G = SEIRAH_SW_F.SEIRAH_SW_F(G, 0.3, 0.5)
+    SEIRAH_CSR.seed(3)
+    dry = SEIRAH_CSR.dry_run(C)
+    F_C = SEIRAH_SW_F.SEIRAH_SW_F(C, 0.3, 0.5)
+
+    assert F_C is C
+    assert state(F_G) == state(F_C)
+    dry.discard()
+    assert np.array_equal(C.status, status)
+
+def test_isolation_matches_nx(city):
+    # Phases switched every tau, commuters resampled every day.
+    G = city()
+    C = SEIRAH_CSR.from_nx(G)
+    rosters = [SEIRAH_Roster.Roster([G], [60]), SEIRAH_Roster.Roster([C], [60])]
+
+    for nwk, roster in zip([G, C], rosters):
+        SEIRAH_CSR.seed(7)
+        for day in range(1, 8):
+            roster.resample(1 - day/10)
+            SEIRAH_SW.SEIRAH_SW(day, nwk, 0.4, 0.5)
+            SEIRAH_CSR.edge_weight_0(nwk)
+            SEIRAH_SW.SEIRAH_SW(day, nwk, 0.4, 0.5)
+            SEIRAH_CSR.edge_weight_1(nwk)
+
+    assert state(G) == state(C)
+    assert not C.isolate and not G.graph['isolate']
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+On-disk topology cache of SEIRAH_Cache: hits, stale entries and eviction.
+
+Usage:
+    python -m pytest -q
+"""
+
+import os
+import numpy as np
+import SEIRAH_Cache as SEIRAH_Cache
+
+def test_topology_cached(tmp_path):
+    path = str(tmp_path)
+    C = SEIRAH_Cache.topology('numpy', 300, 4, 0.1, 5, path=path)
+    D = SEIRAH_Cache.topology('numpy', 300, 4, 0.1, 5, path=path)
+
+    # Second call maps the arrays read only.
+    assert isinstance(D.indices, np.memmap) or isinstance(D.indices.base, np.memmap)
+    for a in SEIRAH_Cache.ARRAYS:
+        assert np.array_equal(getattr(C, a), getattr(D, a))
+    assert len(SEIRAH_Cache.entries(path)) == 1
+
+def test_stale_entry_generated_again(tmp_path, monkeypatch):
+    path = str(tmp_path)
+    C = SEIRAH_Cache.topology('numpy', 300, 4, 0.1, 5, path=path)
+    entry = os.path.join(path, SEIRAH_Cache.key('numpy', 300, 4, 0.1, 5))
+
+    # Arrays that do not match meta.json.
+    np.save(os.path.join(entry, 'indices.npy'), C.indices[:-2])
+    assert SEIRAH_Cache.load(entry, SEIRAH_Cache.params('numpy', 300, 4, 0.1, 5)) is None
+    D = SEIRAH_Cache.topology('numpy', 300, 4, 0.1, 5, path=path)
+    assert np.array_equal(C.indices, D.indices)
+    assert SEIRAH_Cache.load(entry, SEIRAH_Cache.params('numpy', 300, 4, 0.1, 5)) is not None
+
+    # Entry of another VERSION.
+    monkeypatch.setattr(SEIRAH_Cache, 'VERSION', SEIRAH_Cache.VERSION + 1)
+    assert SEIRAH_Cache.load(entry, SEIRAH_Cache.params('numpy', 300, 4, 0.1, 5)) is None
+
+def test_evict_least_recently_used(tmp_path):
+    path = str(tmp_path)
+    for seed in range(3):
+        SEIRAH_Cache.topology('numpy', 300, 4, 0.1, seed, path=path)
+        entry = os.path.join(path, SEIRAH_Cache.key('numpy', 300, 4, 0.1, seed))
+        os.utime(os.path.join(entry, 'meta.json'), (seed, seed))
+    total = sum(size for _, size, _ in SEIRAH_Cache.entries(path))
+
+    # Seed 0 used again, seed 1 is now the oldest. Room for two entries.
+    SEIRAH_Cache.topology('numpy', 300, 4, 0.1, 0, path=path)
+    size = SEIRAH_Cache.entries(path)[0][1]
+    assert SEIRAH_Cache.evict(path, total - size) == total - size
+    left = [e for _, _, e in SEIRAH_Cache.entries(path)]
+    assert left == [os.path.join(path, SEIRAH_Cache.key('numpy', 300, 4, 0.1, s)) for s in [2, 0]]
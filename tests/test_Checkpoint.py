@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""
+Checkpoints of SEIRAH_Checkpoint: state and random streams back as saved.
+
+Usage:
+    python -m pytest -q
+"""
+
+import random
+import numpy as np
+import pytest
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_Checkpoint as SEIRAH_Checkpoint
+
+def test_save_load(tmp_path, city):
+    path = str(tmp_path / 'checkpoint.pkl')
+    C = SEIRAH_CSR.from_nx(city())
+    SEIRAH_CSR.seed(6)
+    SEIRAH_Checkpoint.save(path, 4, {'seed': 6}, {'city_0': C, 'nwks': [C]})
+    draws = random.random(), SEIRAH_CSR.rng.random()
+
+    day, state = SEIRAH_Checkpoint.load(path, {'seed': 6})
+    assert day == 4
+    assert np.array_equal(state['city_0'].status, C.status)
+    # Pickled together, references kept.
+    assert state['nwks'][0] is state['city_0']
+    # Same draws after the resume.
+    assert (random.random(), SEIRAH_CSR.rng.random()) == draws
+
+def test_other_parameters_refused(tmp_path):
+    path = str(tmp_path / 'checkpoint.pkl')
+    SEIRAH_Checkpoint.save(path, 0, {'seed': 6, 'day_n': 60}, {})
+    with pytest.raises(ValueError, match='day_n'):
+        SEIRAH_Checkpoint.load(path, {'seed': 6, 'day_n': 30})
+    assert SEIRAH_Checkpoint.load(path)[0] == 0
+
+def test_due():
+    assert [d for d in range(12) if SEIRAH_Checkpoint.due(d, 5)] == [4, 9]
+    assert not any(SEIRAH_Checkpoint.due(d, 0) for d in range(12))
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+"""
+Results cube of SEIRAH_Cube: one slice and sidecar per run.
+
+Usage:
+    python -m pytest -q
+"""
+
+import numpy as np
+import pytest
+import SEIRAH_Store as SEIRAH_Store
+import SEIRAH_Cube as SEIRAH_Cube
+
+def store(days, value):
+    results = SEIRAH_Store.Store(days)
+    for day in range(days):
+        for t in range(len(SEIRAH_Store.TABLES)):
+            results.set(day, t, np.full(8, value + day))
+    return results
+
+def test_cube_runs(tmp_path):
+    path = str(tmp_path / 'cube')
+    SEIRAH_Cube.write(path, 2, store(5, 10), 3, {'seed': 12, 'tau': [0.5, 0.5]})
+    SEIRAH_Cube.write(path, 0, store(5, 0), 3, {'seed': 10, 'tau': [0.5, 0.5]})
+
+    cube = SEIRAH_Cube.Cube(path)
+    assert cube.array.shape == (3, 5, 5, 8)
+    assert len(cube) == 3 and cube.done() == [0, 2]
+    assert cube.meta(2) == {'seed': 12, 'tau': [0.5, 0.5], 'run': 2, 'days': 5}
+
+    assert cube['H'][2, :, SEIRAH_Store.SHUTO].tolist() == [10, 11, 12, 13, 14]
+    assert cube.table('city_0')[0, 4].tolist() == [4]*8
+    # Runs not done are zeros.
+    assert not cube.array[1].any()
+
+def test_cube_shape_checked(tmp_path):
+    path = str(tmp_path / 'cube')
+    SEIRAH_Cube.write(path, 0, store(5, 0), 3, {})
+    with pytest.raises(ValueError):
+        SEIRAH_Cube.write(path, 1, store(6, 0), 3, {})
+    with pytest.raises(ValueError):
+        SEIRAH_Cube.write(path, 3, store(5, 0), 3, {})
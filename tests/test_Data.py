@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""
+Dataset of SEIRAH_Data against new_cases_cr2020.csv read with csv.
+
+Usage:
+    python -m pytest -q
+"""
+
+import csv as cs
+import numpy as np
+import pytest
+import SEIRAH_Data as SEIRAH_Data
+
+def rows():
+    with open(SEIRAH_Data.DATA_CSV, newline='') as f:
+        return list(cs.reader(f))[1:]
+
+def test_load_once():
+    assert SEIRAH_Data.load() is SEIRAH_Data.load()
+
+def test_columns():
+    data = SEIRAH_Data.load()
+    csv = rows()
+    assert len(data) == len(csv)
+    assert data.Date[3] == csv[3][0] and data.Day[3] == csv[3][1]
+    assert data.cases.shape == (len(csv), 4)
+
+    # Empty cells after the end of data and NaN cells are nan.
+    H = np.array([float(r[6]) if r[6] != '' else np.nan for r in csv])
+    assert np.array_equal(data.H_Shuto, H, equal_nan=True)
+    assert np.isnan(data.H_Shuto[-1])
+    assert np.isnan(data.Rt_Shuto[0]) and np.isnan(data.STD_Shuto[0])
+
+def test_window_and_day_of():
+    data = SEIRAH_Data.load()
+    day = data.day_of('2020/1/24')
+    assert day == 1
+
+    window = data.window(day)
+    assert window.shape == (7, 8)
+    assert window[:, 5].tolist() == data.H_Shuto[day:day + 7].tolist()
+    assert not window[:, [0, 1, 2, 3, 4, 6, 7]].any()
+    with pytest.raises(ValueError):
+        window[0, 5] = 0
+
+def test_head():
+    data = SEIRAH_Data.load()
+    assert data.head('Tokyo', 5).dtype == np.int64
+    assert data.head('CR_Shuto', 400).dtype == np.float64
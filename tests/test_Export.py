@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Binary snapshots of SEIRAH_Export, loaded back and converted to GraphML.
+
+Usage:
+    python -m pytest -q
+"""
+
+import numpy as np
+import networkx as nx
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_SW as SEIRAH_SW
+import SEIRAH_Roster as SEIRAH_Roster
+import SEIRAH_Export as SEIRAH_Export
+
+def run(nwk):
+    # A few days with commuters, ended isolated.
+    SEIRAH_CSR.seed(8)
+    SEIRAH_Roster.Roster([nwk], [40]).resample(1)
+    for day in range(1, 4):
+        SEIRAH_SW.SEIRAH_SW(day, nwk, 0.4, 0.5)
+    return SEIRAH_CSR.edge_weight_0(nwk)
+
+def test_save_load(tmp_path, city):
+    C = run(SEIRAH_CSR.from_nx(city()))
+    for compress in [False, True]:
+        path = str(tmp_path / ('City_0_%d.npz' % compress))
+        SEIRAH_Export.save(path, C, compress)
+        D = SEIRAH_Export.load(path)
+
+        for a in ['indptr', 'indices', 'rev', 'weight', 'status', 'com', 'count']:
+            assert np.array_equal(getattr(C, a), getattr(D, a))
+        for a in SEIRAH_CSR.NODE_ATTR:
+            assert np.array_equal(C.node_attr[a], D.node_attr[a])
+        assert D.isolate and D.active == C.active
+
+    # Ids as int32.
+    with np.load(path) as f:
+        assert f['indices'].dtype == np.int32
+
+def test_graphml(tmp_path, city):
+    G = run(city())
+    path = str(tmp_path / 'City_0.npz')
+    SEIRAH_Export.save(path, G)
+    out = SEIRAH_Export.to_graphml(path)
+    assert out == str(tmp_path / 'City_0.graphml')
+
+    H = nx.read_graphml(out, node_type=int)
+    assert sorted(H.edges()) == sorted(tuple(sorted(e)) for e in G.edges())
+    assert all(H.nodes[i]['status'] == G.nodes[i]['status'] for i in G.nodes())
+    assert {i for i in H.nodes() if H.nodes[i].get('Com')} == \
+           {i for i in G.nodes() if G.nodes[i].get('Com')}
+    # Weights of the isolation phase.
+    assert all(H.edges[i, nbr]['weight'] == SEIRAH_CSR.nx_weight(G, i, nbr) for i, nbr in G.edges())
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+Networks of SEIRAH_Gen: valid simple graphs of the Newman-Watts-Strogatz model.
+
+Usage:
+    python -m pytest -q
+"""
+
+import numpy as np
+import pytest
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_Gen as SEIRAH_Gen
+from SEIRAH_CSR import SUSC, EXPO, INFE, ASYM, HOSP, RECO
+
+def edges(C):
+    row = np.repeat(np.arange(C.number_of_nodes()), np.diff(C.indptr))
+    return row, C.indices
+
+def test_nws_graph_valid():
+    N, k, p = 500, 6, 0.2
+    C = SEIRAH_Gen.nws_graph(N, k, p, 3)
+    row, col = edges(C)
+
+    # Undirected: every slot has its twin, no self-loops, no repeated edges.
+    assert np.array_equal(row[C.rev], col) and np.array_equal(col[C.rev], row)
+    assert not (row == col).any()
+    assert len(np.unique(row*N + col)) == len(row)
+    # Neighbours in id order.
+    assert all((np.diff(col[C.indptr[i]:C.indptr[i + 1]]) > 0).all() for i in range(N))
+
+    # Ring lattice kept, shortcuts about p per lattice edge.
+    lattice = {(i, (i + j) % N) for i in range(N) for j in range(1, k//2 + 1)}
+    assert lattice <= set(zip(row.tolist(), col.tolist()))
+    shortcuts = len(row)//2 - len(lattice)
+    assert 0.5*p*len(lattice) < shortcuts < 1.5*p*len(lattice)
+
+    assert (C.status == SUSC).all() and (C.weight == 1).all()
+
+def test_nws_graph_seeded():
+    A = SEIRAH_Gen.nws_graph(300, 4, 0.1, 7)
+    B = SEIRAH_Gen.nws_graph(300, 4, 0.1, 7)
+    assert np.array_equal(A.indptr, B.indptr) and np.array_equal(A.indices, B.indices)
+    with pytest.raises(ValueError):
+        SEIRAH_Gen.nws_graph(4, 4, 0.1, 7)
+
+def test_g_gene_initial_status():
+    SEIRAH_CSR.seed(1)
+    C = SEIRAH_Gen.G_gene(300, 4, 0.1, 10, 5, 4, 3, 2)
+    assert np.bincount(C.status, minlength=6).tolist() == [276, 10, 5, 4, 3, 2]
+
+    # Edges of initial H weight 0, as G_gene.
+    row, col = edges(C)
+    hosp = (C.status[row] == HOSP) | (C.status[col] == HOSP)
+    assert (C.weight[hosp] == 0).all() and (C.weight[~hosp] == 1).all()
+    assert C.count.tolist() == [276, 10, 5, 4, 3, 2]
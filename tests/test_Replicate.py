@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+Replicate-batched engine against the batched kernel of one network.
+
+Usage:
+    python -m pytest -q
+"""
+
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_SW_B as SEIRAH_SW_B
+import SEIRAH_Replicate as SEIRAH_Replicate
+from SEIRAH_CSR import SUSC, EXPO, INFE, ASYM, HOSP, RECO
+
+def day(nwk, t, sw, weight_0, weight_1, beta_t=0.3, tau=0.5):
+    # Both tau phases of day t, as the day loop of a city.
+    sw(t, nwk, beta_t, tau)
+    weight_0(nwk)
+    sw(t, nwk, beta_t, tau)
+    weight_1(nwk)
+
+def counts(t, C):
+    # S, E, I, R, A, H, Rt, Tt of a CSR_Graph, as Count_status.
+    num, count_Infe_other, count_T, _ = SEIRAH_CSR.count_status(t, C)
+    H = num[HOSP]
+    return [num[SUSC], num[EXPO], num[INFE], num[RECO], num[ASYM], H,
+            count_Infe_other/H if H else 0, count_T/H if H else 0]
+
+def test_batched_kernel_matches_replicate(city):
+    C = SEIRAH_CSR.from_nx(city())
+    RG = SEIRAH_Replicate.Replicate_Graph(C, 1)
+
+    # Day 0 too: nodes never hospitalized have H_1stday 0, they are not new H.
+    for t in range(8):
+        SEIRAH_CSR.seed(9 + t)
+        day(C, t, SEIRAH_SW_B.SEIRAH_SW_B, SEIRAH_CSR.edge_weight_0, SEIRAH_CSR.edge_weight_1)
+        SEIRAH_CSR.seed(9 + t)
+        day(RG, t, SEIRAH_Replicate.SEIRAH_SW_R, SEIRAH_Replicate.edge_weight_0,
+            SEIRAH_Replicate.edge_weight_1)
+        assert np.allclose(counts(t, C), SEIRAH_Replicate.Count_status_R(t, RG)[0])
+
+    assert np.array_equal(C.status, RG.status[0])
+    for a in C.node_attr:
+        assert np.array_equal(C.node_attr[a], RG.node_attr[a][0])
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Daily commuter roster of SEIRAH_Roster.
+
+Usage:
+    python -m pytest -q
+"""
+
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_Roster as SEIRAH_Roster
+
+def com(nwk):
+    return {i for i in range(len(nwk)) if nwk.nodes[i].get('Com')}
+
+def test_roster_resample_clears_previous_day(city):
+    C = SEIRAH_CSR.from_nx(city())
+    G = city()
+    roster = SEIRAH_Roster.Roster([C, G], [80, 80])
+
+    SEIRAH_CSR.seed(4)
+    roster.resample(1)
+    index = roster.resample(0.5)
+
+    assert set(np.flatnonzero(C.com)) == set(index[0][0].tolist())
+    assert com(G) == set(index[1][0].tolist())
+    assert len(index[0][0]) == len(index[1][0]) == 40
+    # CBD slots of a day are its first nodes, cities in order.
+    assert index[0][1].tolist() + index[1][1].tolist() == list(range(80))
+
+def test_roster_refuses_more_than_its_size(city):
+    roster = SEIRAH_Roster.Roster([city()], [10])
+    try:
+        roster.resample(1.5)
+    except ValueError:
+        return
+    assert False
+
+def test_roster_snapshot_restore(city):
+    # Restored with the node state of its city, which keeps the 'Com' flags.
+    C = SEIRAH_CSR.from_nx(city())
+    roster = SEIRAH_Roster.Roster([C], [50])
+    index = roster.resample(0.8)[0][0].copy()
+    snap = roster.snapshot(), SEIRAH_CSR.snapshot(C)
+
+    roster.resample(0.4)
+    roster.restore(snap[0])
+    SEIRAH_CSR.restore(C, snap[1])
+    assert np.array_equal(roster.buffer[0][:roster.n[0]], index)
+    assert set(np.flatnonzero(C.com)) == set(index.tolist())
+
+    # Next day clears the restored commuters.
+    roster.resample(0)
+    assert not C.com.any()
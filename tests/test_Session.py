@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+Small-N runs of SEIRAH_Session: calibration on either backend, snapshots
+and checkpoints.
+
+Usage:
+    python -m pytest -q
+"""
+
+import numpy as np
+import SEIRAH_CSR as SEIRAH_CSR
+import SEIRAH_Session as SEIRAH_Session
+import SEIRAH_Checkpoint as SEIRAH_Checkpoint
+
+PARA = [{'N':300,'k':4,'p':0.1,'NCom':60,'expo':10,'infe':0,'asym':0,'hosp':0,'reco':0},
+        {'N':200,'k':4,'p':0.1,'NCom':20,'expo':5,'infe':0,'asym':0,'hosp':0,'reco':0},
+        {'N':150,'k':4,'p':0.1,'NCom':15,'expo':5,'infe':0,'asym':0,'hosp':0,'reco':0},
+        {'N':100,'k':4,'p':0.1,'NCom':10,'expo':5,'infe':0,'asym':0,'hosp':0,'reco':0}]
+
+def sse(sim, day, beta):
+    # beta_leastsquare of find_beta_t, on a seeded stream.
+    nwks = [sim.CBD] + sim.cities
+    dry_runs = [SEIRAH_CSR.dry_run(nwk) for nwk in nwks]
+    SEIRAH_CSR.seed(11)
+    try:
+        return SEIRAH_Session.beta_leastsquare(beta, day, sim.tau, sim.sw_batch, *nwks,
+                                               sim.Com_index, sim.data.window(day))
+    finally:
+        for dry in dry_runs:
+            dry.discard()
+
+def test_beta_leastsquare_same_on_both_backends():
+    sims = [SEIRAH_Session.Simulation(PARA, day_n=8, seed=3, nwk_backend=b, verbose=False)
+            for b in ['nx', 'csr']]
+    for sim in sims:
+        SEIRAH_CSR.seed(4)
+        sim.step(0, beta_t=0.4)
+        sim.commute(1)
+
+    for beta in [0.2, 0.6]:
+        D = [sse(sim, 1, beta) for sim in sims]
+        assert D[0] == D[1] == sse(sims[1], 1, beta)
+
+def test_snapshot_restore_shares_topology():
+    sim = SEIRAH_Session.Simulation(PARA, day_n=8, seed=3, verbose=False)
+    sim.step(0)
+    snap = sim.snapshot()
+    indptr = sim.city_0.indptr
+    SEIRAH_CSR.seed(5)
+    sim.run()
+    results = sim.results.array.copy()
+
+    # Random streams are not part of the state.
+    sim.restore(snap, day=1)
+    assert sim.city_0.indptr is indptr
+    SEIRAH_CSR.seed(5)
+    sim.run()
+    assert np.array_equal(sim.results.array, results)
+
+def test_checkpoint_resume_matches_run(tmp_path):
+    # Checkpoint of day 2, calibration days 1..6 go on after the resume.
+    path = str(tmp_path / 'checkpoint.pkl')
+    sim = SEIRAH_Session.Simulation(PARA, day_n=8, seed=3, verbose=False)
+    for day in range(3):
+        sim.step(day)
+    SEIRAH_Checkpoint.save(path, 2, {}, sim.snapshot(copy=False))
+    sim.run()
+
+    day, state = SEIRAH_Checkpoint.load(path)
+    resumed = SEIRAH_Session.Simulation(PARA, state=state, day=day + 1, verbose=False)
+    resumed.run()
+
+    assert np.array_equal(sim.results.array, resumed.results.array)
+    assert sim.beta_t_S.equals(resumed.beta_t_S)
+    assert np.array_equal(sim.CBD.status, resumed.CBD.status)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""
+Daily rows of SEIRAH_Sink read back from csv and col files.
+
+Usage:
+    python -m pytest -q
+"""
+
+import os
+import csv as cs
+import numpy as np
+import pytest
+import SEIRAH_Sink as SEIRAH_Sink
+
+def rows(day):
+    # Rows of city_0 and Shuto for one day, realH NaN on day 2.
+    result = [0, 3 + day, 2, day, 1, 4, 0.5, 7.25]
+    real_H = 'NaN' if day == 2 else day
+    return [SEIRAH_Sink.row('2020/1/%d' % (16 + day), 'Thu', 0.1*day, result, real_H, 100, 4, 0.1, 20),
+            SEIRAH_Sink.row('2020/1/%d' % (16 + day), 'Thu', 0.1*day, result, real_H, 400, 4, 0.1, 80)]
+
+def read_csv(file):
+    with open(file, newline='') as f:
+        return list(cs.reader(f))
+
+def sink(tmp_path, fmt='both', start=0):
+    files = [str(tmp_path / 'output_city_0.csv'), str(tmp_path / 'output_Shuto.csv')]
+    return SEIRAH_Sink.Sink(files, ['city_0', 'Shuto'], fmt, batch=2, start=start), files
+
+def test_csv_col_round_trip(tmp_path):
+    out, files = sink(tmp_path)
+    for day in range(3):
+        out.write(day, rows(day))
+
+    # Written every 2 days.
+    assert len(read_csv(files[0])) == 1 + 2
+    out.close()
+
+    csv = read_csv(files[0])
+    assert csv[0] == SEIRAH_Sink.header('city_0')
+    assert [r[0] for r in csv[1:]] == ['2020/1/16', '2020/1/17', '2020/1/18']
+    assert float(csv[2][3]) == 100 - 4 - 2 - 1 - 1 - 4   # S = N-E-I-R-A-H
+
+    col = SEIRAH_Sink.load_columns(os.path.splitext(files[0])[0] + '.col')
+    assert col['day'].tolist() == [0, 1, 2]
+    assert col['city_0_S'].tolist() == [float(r[3]) for r in csv[1:]]
+    assert col['city_0_realH'][:2].tolist() == [0, 1] and np.isnan(col['city_0_realH'][2])
+    assert col['city_0_NCom'].tolist() == [20, 20, 20]
+
+def test_resumed_sink_keeps_rows(tmp_path):
+    out, files = sink(tmp_path)
+    for day in range(4):
+        out.write(day, rows(day))
+    out.close()
+
+    # Resumed after day 1: days 2.. written again.
+    out, files = sink(tmp_path, start=2)
+    out.write(2, rows(2))
+    out.close()
+    assert [r[0] for r in read_csv(files[1])[1:]] == ['2020/1/16', '2020/1/17', '2020/1/18']
+    col = SEIRAH_Sink.load_columns(os.path.splitext(files[1])[0] + '.col')
+    assert col['day'].tolist() == [0, 1, 2]
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        sink(tmp_path, 'parquet')
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+"""
+Result store of SEIRAH_Store.
+
+Usage:
+    python -m pytest -q
+"""
+
+import numpy as np
+import SEIRAH_Store as SEIRAH_Store
+
+def test_store_grows():
+    results = SEIRAH_Store.Store(days=3)
+    result = np.arange(8.)
+    for day in range(3):
+        results.set(day, SEIRAH_Store.SHUTO, result + day)
+    data = results.data
+    assert len(results.data) == 3
+
+    # Doubled when a day does not fit, days set are kept.
+    results.set(6, 0, result)
+    assert len(results.data) == 12 and len(results) == 7
+    assert results.data is not data
+    assert np.array_equal(results.array[:3], data)
+
+    # Days not set read as 0.
+    assert not results.array[3:6].any()
+
+def test_store_views():
+    results = SEIRAH_Store.Store(days=2)
+    results.set(0, 1, np.arange(8.))
+    results.set(1, SEIRAH_Store.SHUTO, np.arange(8.) + 1)
+
+    assert results.array.shape == (2, 5, 8)
+    assert results.table('city_1')[0].tolist() == list(range(8))
+    assert results.table(SEIRAH_Store.SHUTO)[1].tolist() == list(range(1, 9))
+    assert results['H'].tolist() == [[0, 5, 0, 0, 0], [0, 0, 0, 0, 6]]
+    assert np.array_equal(results.Rt, results['Rt'])